@@ -1,117 +1,35 @@
 import streamlit as st
 import json
-import pandas as pd
-import io
-import xlsxwriter
-import altair as alt
-import plotly.graph_objects as go  # For the UI radar chart
+import hashlib
+import os
+import time
+import uuid
+
+from maturity.framework import FrameworkError, load_config
+from maturity.scoring import get_rating_color
+from maturity.model import make_domain_result
+from maturity.results import ResultSet
+from maturity.charts import progress_chart_spec, ratings_fingerprint, results_chart_specs
+from maturity.store import DebouncedWriter, open_store
+from maturity.excel import report_filename
+from maturity.templates import level_texts
+from maturity.metrics import REGISTRY, serve_metrics, timer
+from maturity.jobs import DONE, FAILED, JobQueueFull, ReportQueue
+from maturity.importer import AssessmentImportError, read_assessments
+from maturity.workspace import Workspace
+from maturity.cohort import DEFAULT_COHORT_DIR, CohortStore
+from maturity.progress import ProgressHistory
 
 ###############################################################################
-# 1. Constants & Configuration
+# 1. Session State & Setup
 ###############################################################################
 
-PHASES = ["Plan & Design", "Implement", "Operate & Improve"]
-
-# Maturity level details with descriptions
-MATURITY_LEVELS_DETAILS = {
-    "1": [
-        "AI implementation is experimental with no structured approach.",
-        "AI models are built in isolation with no integration.",
-        "AI processes are inconsistent and lack standardization.",
-        "Processes are seen as unpredictable, poorly controlled, and reactive.",
-        "Capability limited to a few individuals.",
-        "Success is based on individual competence."
-    ],
-    "2": [
-        "Some AI processes are repeatable but vary across teams.",
-        "AI is used in specific functions with minimal cross-discipline collaboration.",
-        "Limited AI governance and standardization exist.",
-        "Teams establish the processes. Little cross-discipline activity.",
-        "Processes are characterized by projects and are frequently reactive.",
-        "Limited but growing capabilities.",
-        "Capabilities developed and adopted but limited to a project."
-    ],
-    "3": [
-        "AI strategies and governance frameworks are well-documented.",
-        "AI adoption is organization-wide with standard AI best practices.",
-        "AI models are consistently optimized and monitored.",
-        "Process defined and documented, and consistently followed across the organization.",
-        "Defined goals and standardized processes and tools.",
-        "Capabilities developed and adopted.",
-        "Capabilities used to deliver service.",
-        "Synergy amongst disciplines is leveraged."
-    ],
-    "4": [
-        "AI is integrated into business processes with measurable KPIs.",
-        "AI-driven automation improves operational efficiency.",
-        "Ethical AI frameworks and compliance measures are in place.",
-        "Capabilities are well developed and practiced with appropriate governance.",
-        "Methodologies, tools, and templates are readily available.",
-        "Processes are measured and controlled with KPIs.",
-        "Core skillsets and dedicated teams available.",
-        "Organization uses quantitative data for service development."
-    ],
-    "5": [
-        "AI is a key driver of business innovation and growth.",
-        "AI models are continuously improved with real-time feedback.",
-        "AI governance ensures ethical, fair, and explainable AI.",
-        "Improvement methodologies are implemented.",
-        "Metrics and KPIs are regularly monitored.",
-        "New value propositions developed based on competitive landscape.",
-        "Anticipates technology and industry trends.",
-        "Creative and collaborative culture.",
-        "Processes are stable and flexible."
-    ]
-}
-
-# Maturity level names
-MATURITY_LEVEL_NAMES = {
-    "1": "Adhoc",
-    "2": "Repeatable",
-    "3": "Defined",
-    "4": "Optimized",
-    "5": "Innovative"
-}
-
-# Categories and domains
-CATEGORIES = {
-    "Business": [
-        "AI Discovery & Use Case Development",
-        "AI Strategy & Governance",
-        "Cost Management and Workload Optimization"
-    ],
-    "Process": [
-        "AI Infrastructure & Compute",
-        "AI Model Development & Experimentation",
-        "AI Deployment & MLOps",
-        "AI Governance & Compliance",
-        "AI Bias Detection & Ethical AI"
-    ],
-    "Tools": [
-        "AI Performance Optimization",
-        "AI Automation and Monitoring"
-    ]
-}
-
-# Color mapping for maturity levels
-MATURITY_COLORS = {
-    1: '#F08080',  # Adhoc (Light Red)
-    2: '#F4A460',  # Repeatable (Sandy Brown)
-    3: '#FFFF99',  # Defined (Light Yellow)
-    4: '#90EE90',  # Optimized (Light Green)
-    5: '#98FB98'   # Innovative (Pale Green)
-}
-
-###############################################################################
-# 2. Session State & Setup
-###############################################################################
-
-def init_session_state():
+def init_session_state(framework):
     """Initialize session state variables."""
     if "current_domain_index" not in st.session_state:
         st.session_state.current_domain_index = 0
     if "results" not in st.session_state:
-        st.session_state.results = []
+        st.session_state.results = ResultSet(framework)
     if "show_results" not in st.session_state:
         st.session_state.show_results = False
     if "assessment_data" not in st.session_state:
@@ -120,11 +38,238 @@ def init_session_state():
         st.session_state.partner_name = ""
     if "domain_states" not in st.session_state:
         st.session_state.domain_states = {}
+    if "report_cache" not in st.session_state:
+        st.session_state.report_cache = {}
+    if "workspace" not in st.session_state:
+        st.session_state.workspace = Workspace()
+    if "assessment_id" not in st.session_state:
+        st.session_state.assessment_id = None
+        # Resume an assessment after a browser refresh or server restart
+        assessment_id = st.query_params.get("assessment")
+        if assessment_id:
+            restore_assessment(assessment_id, framework)
+
+@st.cache_resource
+def get_assessment_writer():
+    """Get the process-wide debounced writer for the assessment store."""
+    return DebouncedWriter(open_store())
+
+def restore_assessment(assessment_id, framework):
+    """Load a parked or stored assessment into session state. Returns False if not found."""
+    snapshot = st.session_state.workspace.unpark(assessment_id)
+    if snapshot is not None:
+        partner_name, domain_states, completed = (
+            snapshot.partner_name, snapshot.domain_states(framework), snapshot.completed)
+    else:
+        writer = get_assessment_writer()
+        # Changes another session still holds back would be missing otherwise
+        writer.flush(assessment_id)
+        stored = writer.store.load(assessment_id)
+        if stored is None:
+            return False
+        partner_name, domain_states, completed = (
+            stored.partner_name, stored.domain_states, stored.completed)
+
+    clear_form_state(framework)
+    st.session_state.assessment_id = assessment_id
+    st.session_state.partner_name = partner_name
+    st.session_state.domain_states = domain_states
+    st.session_state.results = ResultSet(framework, results=(
+        make_domain_result(domain, domain_states[domain], framework)
+        for domain in framework.domains if domain in completed
+    ))
+    remaining = [i for i, domain in enumerate(framework.domains) if domain not in completed]
+    st.session_state.current_domain_index = remaining[0] if remaining else len(framework.domains) - 1
+    st.session_state.show_results = not remaining
+    st.session_state.workspace.open(assessment_id, partner_name)
+    st.query_params["assessment"] = assessment_id
+    return True
+
+def clear_form_state(framework):
+    """Drop the form widgets' values so the next assessment starts from its own."""
+    for domain in framework.domains:
+        for phase in framework.phases:
+            for field in ("rating", "details"):
+                st.session_state.pop(get_domain_state_key(domain, f"{phase}_{field}"), None)
+
+def park_assessment(framework):
+    """Move the active assessment out of session state into the workspace."""
+    assessment_id = st.session_state.assessment_id
+    if assessment_id is None:
+        return
+    get_assessment_writer().flush(assessment_id)
+    st.session_state.workspace.park(
+        assessment_id,
+        st.session_state.partner_name,
+        st.session_state.domain_states,
+        [res.domain for res in st.session_state.results],
+        framework
+    )
 
-def load_config():
-    """Load configuration from JSON file."""
-    with open('ai_maturity_framework_final.json', 'r') as f:
-        return json.load(f)
+def new_assessment(framework):
+    """Park the active assessment and return to the partner name prompt."""
+    park_assessment(framework)
+    clear_form_state(framework)
+    st.session_state.assessment_id = None
+    st.session_state.partner_name = ""
+    st.session_state.domain_states = {}
+    st.session_state.results = ResultSet(framework)
+    st.session_state.current_domain_index = 0
+    st.session_state.show_results = False
+    st.session_state.pop("partner_name_input", None)
+    st.query_params.pop("assessment", None)
+
+def switch_assessment(assessment_id, framework):
+    """Make another open assessment the active one."""
+    previous_id = st.session_state.assessment_id
+    if assessment_id == previous_id:
+        return
+    park_assessment(framework)
+    if not restore_assessment(assessment_id, framework):
+        st.session_state.workspace.close(assessment_id)
+        if previous_id is not None:
+            restore_assessment(previous_id, framework)
+
+def display_workspace_sidebar(framework):
+    """List the session's open assessments in the sidebar for switching between them."""
+    workspace = st.session_state.workspace
+    active = st.session_state.assessment_id
+    if not len(workspace) and active is None:
+        return
+    with st.sidebar:
+        st.subheader("🗂️ Assessments")
+        entries = sorted(workspace.items(), key=lambda entry: entry[1].lower())
+        ids = [assessment_id for assessment_id, _ in entries]
+        # A partner can have several assessments open, so each shows how far it is
+        labels = {}
+        for assessment_id, partner_name in entries:
+            if assessment_id == active:
+                done = len(st.session_state.results)
+            else:
+                completed = workspace.completed(assessment_id)
+                done = sum(domain in completed for domain in framework.domains)
+            labels[assessment_id] = f"{partner_name} · {done}/{len(framework.domains)} domains"
+        choice = st.radio(
+            "Open assessments",
+            ids,
+            index=ids.index(active) if active in labels else None,
+            format_func=labels.get,
+            label_visibility="collapsed"
+        )
+        if choice is not None and choice != active:
+            switch_assessment(choice, framework)
+            st.rerun()
+        if active is not None and st.button("➕ New assessment"):
+            new_assessment(framework)
+            st.rerun()
+
+def commit_session_state():
+    """Write this session's staged changes at the end of a rerun if the store is shared.
+
+    Another app server may serve the session's next rerun after a reconnect,
+    so a shared store gets one batched write per rerun instead of waiting
+    for the debounce delay.
+    """
+    writer = get_assessment_writer()
+    if writer.store.shared and st.session_state.get("assessment_id"):
+        writer.flush(st.session_state.assessment_id)
+
+def start_assessment(partner_name, framework):
+    """Resume the partner's unfinished assessment, or start a new one."""
+    writer = get_assessment_writer()
+    writer.flush(partner_name=partner_name)
+    assessment_id = writer.store.find_incomplete(partner_name, framework)
+    if assessment_id is None or not restore_assessment(assessment_id, framework):
+        clear_form_state(framework)
+        st.session_state.partner_name = partner_name
+        st.session_state.assessment_id = uuid.uuid4().hex
+        st.session_state.workspace.open(st.session_state.assessment_id, partner_name)
+        st.query_params["assessment"] = st.session_state.assessment_id
+
+def import_assessment(uploaded_file, framework):
+    """Store an uploaded report or CSV as a new assessment and open it."""
+    records = read_assessments(uploaded_file, framework, filename=uploaded_file.name)
+    if len(records) > 1:
+        raise AssessmentImportError("the file holds several partners; import it with "
+                                    "python -m maturity.importer instead")
+    domain_states = {
+        res.domain: {
+            phase: {
+                "rating": p.rating,
+                "partner_details": p.partner_details,
+                "comments": p.comments
+            }
+            for phase, p in zip(framework.phases, res.phases)
+        }
+        for res in records[0]["results"]
+    }
+    assessment_id = uuid.uuid4().hex
+    get_assessment_writer().store.save(
+        assessment_id, records[0]["partner_name"], domain_states, completed=domain_states
+    )
+    if len(records[0]["results"]) == len(framework.domains):
+        # Partial imports are recorded once the remaining domains are saved
+        get_cohort_store(framework).append(records[0]["partner_name"], records[0]["results"],
+                                           assessment_id=assessment_id)
+    restore_assessment(assessment_id, framework)
+
+def display_import_option(framework):
+    """Offer to continue from a filled-in report or CSV instead of starting over."""
+    with st.expander("📤 Import a completed assessment (Excel report or CSV)"):
+        uploaded_file = st.file_uploader(
+            "Assessment file",
+            type=["xlsx", "csv"],
+            help="A report exported by this app, or a file with its Comments or Ratings columns"
+        )
+        if uploaded_file is not None:
+            try:
+                import_assessment(uploaded_file, framework)
+            except Exception as e:
+                st.error(f"Could not import {uploaded_file.name}: {e}")
+                return
+            st.rerun()
+
+def get_cohort_store(framework):
+    """Get the process-wide store of completed assessment rounds for a framework."""
+    return open_cohort_store(framework.path, framework.mtime, framework)
+
+@st.cache_resource(max_entries=4)
+def open_cohort_store(framework_path, framework_mtime, _framework):
+    """Open the cohort store once per version of the framework file."""
+    return CohortStore(DEFAULT_COHORT_DIR, _framework)
+
+@st.cache_resource
+def get_report_queue():
+    """Get the process-wide background report builder."""
+    return ReportQueue()
+
+@st.cache_resource
+def start_metrics_server():
+    """Serve Prometheus metrics once per process if AI_MATURITY_METRICS_PORT is set."""
+    port = os.environ.get("AI_MATURITY_METRICS_PORT")
+    return serve_metrics(int(port)) if port else None
+
+def debug_enabled():
+    """Whether to show the debug panel (``?debug=1`` or AI_MATURITY_DEBUG=1)."""
+    return st.query_params.get("debug") == "1" or os.environ.get("AI_MATURITY_DEBUG") == "1"
+
+def display_debug_panel():
+    """Show the timings of recent reruns and report builds in the sidebar."""
+    with st.sidebar.expander("⏱️ Performance (all sessions)"):
+        rows = []
+        for profile in REGISTRY.recent_profiles():
+            row = {
+                "Started": time.strftime("%H:%M:%S", time.localtime(profile.started)),
+                "Total ms": round(profile.seconds * 1000, 1)
+            }
+            for _, stage, seconds in profile.stages:
+                row[stage] = round(row.get(stage, 0) + seconds * 1000, 1)
+            rows.append(row)
+        if rows:
+            st.dataframe(rows, hide_index=True)
+        else:
+            st.write("No reruns recorded yet.")
+        st.code(REGISTRY.prometheus_text(), language="text")
 
 def setup_page():
     """Configure page settings and styling."""
@@ -285,563 +430,15 @@ def apply_custom_styling():
     """, unsafe_allow_html=True)
 
 ###############################################################################
-# 3. Excel Generation Functions
-###############################################################################
-
-def sanitize_sheet_name(name: str) -> str:
-    """Sanitize partner name to a valid Excel sheet name (max 31 chars)."""
-    invalid_chars = [':', '\\', '/', '?', '*', '[', ']']
-    for c in invalid_chars:
-        name = name.replace(c, '')
-    # Truncate to 25, then we'll add a short prefix
-    name = name[:25]
-    return name
-
-def get_rating_color(rating):
-    """Get color for a rating value, handling float values."""
-    if isinstance(rating, (int, float)):
-        # Round float values to nearest integer for color mapping
-        rating_int = int(round(rating))
-        return MATURITY_COLORS.get(rating_int, '#FFFFFF')
-    return '#FFFFFF'
-
-def create_excel_workbook(results, framework, partner_name):
-    """Generate Excel report with all sheets."""
-    try:
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            workbook = writer.book
-            
-            # Create Partner Details sheet
-            create_partner_details_sheet(workbook, writer, partner_name)
-            
-            # Create other sheets without partner name
-            create_ratings_sheet(workbook, writer, results, framework, "Ratings")
-            create_heatmap_sheet(workbook, results, "Heatmap")
-            create_comments_sheet(workbook, writer, results, "Comments")
-            create_definitions_sheet(workbook, writer, "Definitions")
-            create_charts_sheet(workbook, writer, results, "Charts")
-        
-        output.seek(0)
-        return output
-    except Exception as e:
-        st.error(f"Error creating Excel workbook: {str(e)}")
-        return None
-
-def create_partner_details_sheet(workbook, writer, partner_name):
-    """Create a sheet with partner assessment details."""
-    ws = writer.book.add_worksheet("Partner Details")
-    
-    # Set column width
-    ws.set_column('A:B', 30)
-    
-    # Create formats
-    header_format = workbook.add_format({
-        'bold': True,
-        'font_size': 12,
-        'align': 'left',
-        'valign': 'vcenter',
-        'font_color': '#003366'
-    })
-    
-    value_format = workbook.add_format({
-        'font_size': 11,
-        'align': 'left',
-        'valign': 'vcenter'
-    })
-    
-    # Add assessment details with formatted date and time
-    current = pd.Timestamp.now()
-    date_str = current.strftime("%d-%m-%Y")
-    time_str = current.strftime("%I:%M %p %Z")  # 12-hour format with AM/PM and timezone
-    
-    details = [
-        ["Partner Name", partner_name],
-        ["Assessment Date", date_str],
-        ["Assessment Time", time_str],
-        ["Assessed By", "Meet Shah"]
-    ]
-    
-    for row, (label, value) in enumerate(details):
-        ws.write(row, 0, label, header_format)
-        ws.write(row, 1, value, value_format)
-
-def create_ratings_sheet(workbook, writer, results, framework, sheet_name):
-    """Create the Ratings sheet with color coding."""
-    ratings_rows = []
-    for cat, domains in CATEGORIES.items():
-        for res in results:
-            domain = res.get("Domain") if isinstance(res, pd.Series) else res["Domain"]
-            if domain in domains:
-                for phase in PHASES:
-                    if isinstance(res, pd.Series):
-                        rating = res.get((phase, "rating"))
-                    else:
-                        rating = res[phase]["rating"]
-                    summary = framework["maturity_levels"][str(rating)]["name"]
-                    ratings_rows.append({
-                        "Category": cat,
-                        "Domain": domain,
-                        "Phase": phase,
-                        "Rating": rating,
-                        "Summary": summary
-                    })
-    
-    df = pd.DataFrame(ratings_rows)
-    df.to_excel(writer, sheet_name=sheet_name, index=False)
-    format_ratings_sheet(workbook, writer.sheets[sheet_name], df)
-
-def format_ratings_sheet(workbook, worksheet, df):
-    """Apply formatting to the Ratings sheet (color code Rating and Summary)."""
-    header_format = workbook.add_format({
-        'bg_color': '#003366',
-        'font_color': 'white',
-        'bold': True,
-        'align': 'center',
-        'valign': 'vcenter',
-        'border': 1,
-        'text_wrap': True
-    })
-    
-    cell_format = workbook.add_format({
-        'border': 1,
-        'text_wrap': True,
-        'align': 'center',
-        'valign': 'vcenter'
-    })
-
-    # Write headers
-    for col, val in enumerate(df.columns):
-        worksheet.write(0, col, val, header_format)
-        worksheet.set_column(col, col, 25)
-
-    # Write data with color coding
-    for row_num, row_data in enumerate(df.itertuples(index=False), start=1):
-        for col_num, col_name in enumerate(df.columns):
-            value = getattr(row_data, col_name)
-            if col_name == "Rating":
-                color = get_rating_color(value)
-                fmt = workbook.add_format({
-                    'bg_color': color,
-                    'border': 1,
-                    'align': 'center',
-                    'valign': 'vcenter'
-                })
-                worksheet.write(row_num, col_num, value, fmt)
-            elif col_name == "Summary":
-                # Color code the Summary with the same color as the rating
-                rating_val = getattr(row_data, "Rating")
-                color = get_rating_color(rating_val)
-                fmt = workbook.add_format({
-                    'bg_color': color,
-                    'border': 1,
-                    'align': 'center',
-                    'valign': 'vcenter'
-                })
-                worksheet.write(row_num, col_num, value, fmt)
-            else:
-                worksheet.write(row_num, col_num, value, cell_format)
-
-def create_heatmap_sheet(workbook, results, sheet_name):
-    """Create heatmap sheet with domain and category level data."""
-    worksheet = workbook.add_worksheet(sheet_name)
-    
-    # Set column widths
-    worksheet.set_column('A:A', 30)  # Domain/Category column
-    worksheet.set_column('B:D', 15)  # Phase columns
-    
-    # Create formats
-    header_format = workbook.add_format({
-        'bold': True,
-        'font_size': 11,
-        'align': 'center',
-        'valign': 'vcenter',
-        'bg_color': '#D9D9D9'
-    })
-    
-    # Write domain-level headers
-    headers = ['Domain', 'Plan & Design', 'Implement', 'Operate & Improve']
-    for col, header in enumerate(headers):
-        worksheet.write(0, col, header, header_format)
-    
-    # Process domain-level data
-    domain_data = []
-    row = 1
-    for res in results:
-        if isinstance(res, pd.Series):
-            domain_row = [
-                res.get("Domain"),
-                res.get(("Plan & Design", "rating"), 0),
-                res.get(("Implement", "rating"), 0),
-                res.get(("Operate & Improve", "rating"), 0)
-            ]
-        else:
-            domain_row = [
-                res["Domain"],
-                res["Plan & Design"]["rating"],
-                res["Implement"]["rating"],
-                res["Operate & Improve"]["rating"]
-            ]
-        domain_data.append(domain_row)
-        for col, value in enumerate(domain_row):
-            cell_format = workbook.add_format({
-                'align': 'center',
-                'valign': 'vcenter',
-                'font_size': 10
-            })
-            if col > 0:  # For rating columns
-                cell_format.set_bg_color(get_rating_color(value))
-            worksheet.write(row, col, value, cell_format)
-        row += 1
-    
-    domain_end_row = row
-    
-    # Add domain-level chart (positioned after domain table)
-    domain_chart_row = domain_end_row + 2
-    add_domain_chart(workbook, worksheet, pd.DataFrame(domain_data, columns=headers), 0, sheet_name, domain_chart_row)
-    
-    # Add spacing between tables (after domain chart)
-    category_start_row = domain_chart_row + 22  # Enough space for the chart
-    
-    # Write category-level headers
-    for col, header in enumerate(headers):
-        worksheet.write(category_start_row, col, header.replace('Domain', 'Category'), header_format)
-    
-    # Process category-level data
-    category_data = []
-    categories_seen = set()
-    row = category_start_row + 1
-    
-    for res in results:
-        domain = res["Domain"] if isinstance(res, dict) else res.get("Domain")
-        category = get_category_for_domain(domain)
-        
-        if category not in categories_seen:
-            categories_seen.add(category)
-            category_ratings = {"Category": category}
-            category_count = 0
-            category_sums = {phase: 0 for phase in PHASES}
-            
-            # Calculate average ratings for the category
-            for inner_res in results:
-                inner_domain = inner_res["Domain"] if isinstance(inner_res, dict) else inner_res.get("Domain")
-                if get_category_for_domain(inner_domain) == category:
-                    category_count += 1
-                    for phase in PHASES:
-                        if isinstance(inner_res, pd.Series):
-                            rating = inner_res.get((phase, "rating"), 0)
-                        else:
-                            rating = inner_res[phase]["rating"]
-                        category_sums[phase] += rating
-            
-            # Calculate averages
-            for phase in PHASES:
-                category_ratings[phase] = round(category_sums[phase] / category_count, 2) if category_count > 0 else 0
-            
-            category_row = [
-                category_ratings["Category"],
-                category_ratings["Plan & Design"],
-                category_ratings["Implement"],
-                category_ratings["Operate & Improve"]
-            ]
-            category_data.append(category_row)
-            
-            for col, value in enumerate(category_row):
-                cell_format = workbook.add_format({
-                    'align': 'center',
-                    'valign': 'vcenter',
-                    'font_size': 10
-                })
-                if col > 0:  # For rating columns
-                    cell_format.set_bg_color(get_rating_color(value))
-                worksheet.write(row, col, value, cell_format)
-            row += 1
-    
-    # Add category-level chart (positioned after category table)
-    if category_data:
-        category_chart_row = row + 2
-        add_category_chart(workbook, worksheet, pd.DataFrame(category_data, columns=headers), category_start_row, sheet_name, category_chart_row)
-
-def add_domain_chart(workbook, worksheet, df, startrow, sheet_name, chart_row):
-    """Add enhanced chart for domain-level data."""
-    if df.empty:
-        return
-        
-    chart = workbook.add_chart({'type': 'column'})
-    if not chart:
-        return
-    
-    # Add series for each phase with custom colors
-    colors = ['#4472C4', '#ED7D31', '#A5A5A5']  # Blue, Orange, Gray
-    for i, (phase, color) in enumerate(zip(PHASES, colors), start=1):
-        chart.add_series({
-            'name':       [sheet_name, startrow, i],
-            'categories': [sheet_name, startrow + 1, 0, startrow + len(df), 0],
-            'values':     [sheet_name, startrow + 1, i, startrow + len(df), i],
-            'fill':       {'color': color},
-            'border':     {'color': color},
-        })
-    
-    chart.set_title({'name': 'Domain Level Maturity Ratings', 'font': {'size': 12, 'bold': True}})
-    chart.set_x_axis({
-        'name': 'Domains',
-        'font': {'size': 10},
-        'num_font': {'size': 9},
-        'label_position': 'low',
-        'num_format': '@'  # Treat as text to show full domain names
-    })
-    chart.set_y_axis({
-        'name': 'Rating',
-        'min': 0,
-        'max': 5,
-        'major_unit': 1,
-        'font': {'size': 10},
-        'num_font': {'size': 9},
-    })
-    chart.set_style(2)
-    chart.set_size({'width': 720, 'height': 400})
-    chart.set_legend({'position': 'bottom'})
-    
-    worksheet.insert_chart(chart_row, 0, chart)
-
-def add_category_chart(workbook, worksheet, df, startrow, sheet_name, chart_row):
-    """Add enhanced chart for category-level data."""
-    if df.empty:
-        return
-        
-    chart = workbook.add_chart({'type': 'column'})
-    if not chart:
-        return
-    
-    # Add series for each phase with custom colors
-    colors = ['#4472C4', '#ED7D31', '#A5A5A5']  # Blue, Orange, Gray
-    for i, (phase, color) in enumerate(zip(PHASES, colors), start=1):
-        chart.add_series({
-            'name':       [sheet_name, startrow, i],
-            'categories': [sheet_name, startrow + 1, 0, startrow + len(df), 0],
-            'values':     [sheet_name, startrow + 1, i, startrow + len(df), i],
-            'fill':       {'color': color},
-            'border':     {'color': color},
-        })
-    
-    chart.set_title({'name': 'Category Level Maturity Ratings', 'font': {'size': 12, 'bold': True}})
-    chart.set_x_axis({
-        'name': 'Categories',
-        'font': {'size': 10},
-        'num_font': {'size': 9},
-        'label_position': 'low',
-        'num_format': '@'
-    })
-    chart.set_y_axis({
-        'name': 'Rating',
-        'min': 0,
-        'max': 5,
-        'major_unit': 1,
-        'font': {'size': 10},
-        'num_font': {'size': 9},
-    })
-    chart.set_style(2)
-    chart.set_size({'width': 720, 'height': 400})
-    chart.set_legend({'position': 'bottom'})
-    
-    worksheet.insert_chart(chart_row, 0, chart)
-
-def create_comments_sheet(workbook, writer, results, sheet_name):
-    """Create the Detailed Comments sheet."""
-    comments_rows = []
-    for res in results:
-        domain = res.get("Domain") if isinstance(res, pd.Series) else res["Domain"]
-        for phase in PHASES:
-            if isinstance(res, pd.Series):
-                rating = res.get((phase, "rating"))
-                comments = res.get((phase, "comments"))
-                partner_details = res.get((phase, "partner_details"), "")
-            else:
-                rating = res[phase]["rating"]
-                comments = res[phase]["comments"]
-                partner_details = res[phase].get("partner_details", "")
-                
-            comments_rows.append({
-                "Domain": domain,
-                "Phase": phase,
-                "Rating": rating,
-                "Selected Points": comments,
-                "Partner Specific Details": partner_details
-            })
-
-    df = pd.DataFrame(comments_rows)
-    df.to_excel(writer, sheet_name=sheet_name, index=False)
-    format_comments_sheet(workbook, writer.sheets[sheet_name], df)
-
-def format_comments_sheet(workbook, worksheet, df):
-    """Apply formatting to the Detailed Comments sheet."""
-    header_format = workbook.add_format({
-        'bg_color': '#003366',
-        'font_color': 'white',
-        'bold': True,
-        'align': 'center',
-        'border': 1
-    })
-    cell_format = workbook.add_format({'border': 1, 'align': 'center'})
-    
-    # Write header row
-    for col, col_name in enumerate(df.columns):
-        worksheet.write(0, col, col_name, header_format)
-        worksheet.set_column(col, col, 30)
-    
-    # Write data rows using index-based access
-    for row_num, row_data in enumerate(df.itertuples(index=False), start=1):
-        for col_num, _ in enumerate(df.columns):
-            value = row_data[col_num]
-            worksheet.write(row_num, col_num, value, cell_format)
-
-def create_definitions_sheet(workbook, writer, sheet_name):
-    """
-    Create the Ratings Definition sheet in Excel using the local
-    MATURITY_LEVELS_DETAILS + MATURITY_LEVEL_NAMES, with color-coded headers.
-    """
-    ws = workbook.add_worksheet(sheet_name)
-    cell_format = workbook.add_format({'border': 1, 'text_wrap': True})
-
-    sorted_levels = sorted(MATURITY_LEVELS_DETAILS.keys(), key=int)
-    for i, level in enumerate(sorted_levels):
-        level_title = f"{level} = {MATURITY_LEVEL_NAMES[level]}"
-        color = get_rating_color(int(level))
-        level_format = workbook.add_format({
-            'bg_color': color,
-            'font_color': 'black',
-            'bold': True,
-            'align': 'center',
-            'border': 1,
-            'text_wrap': True
-        })
-        ws.write(0, i, level_title, level_format)
-
-        bullet_points = MATURITY_LEVELS_DETAILS[level]
-        for row_index, bullet in enumerate(bullet_points, start=1):
-            ws.write(row_index, i, bullet, cell_format)
-        ws.set_column(i, i, 40)
-
-def create_charts_sheet(workbook, writer, results, sheet_name):
-    """Create enhanced charts sheet with color coding."""
-    if not results:
-        return
-
-    ws = workbook.add_worksheet(sheet_name)
-    
-    # Prepare data
-    data_rows = []
-    for res in results:
-        if isinstance(res, pd.Series):
-            domain = res.get("Domain")
-            row = {
-                "Domain": domain,
-                "Plan & Design": res.get(("Plan & Design", "rating"), 0),
-                "Implement": res.get(("Implement", "rating"), 0),
-                "Operate & Improve": res.get(("Operate & Improve", "rating"), 0)
-            }
-        else:
-            row = {
-                "Domain": res["Domain"],
-                "Plan & Design": res["Plan & Design"]["rating"],
-                "Implement": res["Implement"]["rating"],
-                "Operate & Improve": res["Operate & Improve"]["rating"]
-            }
-        data_rows.append(row)
-
-    if not data_rows:
-        return
-
-    # Write color-coded table
-    headers = ["Domain"] + PHASES
-    header_format = workbook.add_format({
-        'bold': True,
-        'bg_color': '#4472C4',
-        'font_color': 'white',
-        'align': 'center',
-        'border': 1
-    })
-
-    for col, header in enumerate(headers):
-        ws.write(0, col, header, header_format)
-        ws.set_column(col, col, 15)
-
-    for row, data in enumerate(data_rows, start=1):
-        ws.write(row, 0, data["Domain"])
-        for col, phase in enumerate(PHASES, start=1):
-            value = data[phase]
-            color = get_rating_color(value)
-            fmt = workbook.add_format({
-                'bg_color': color,
-                'align': 'center',
-                'border': 1
-            })
-            ws.write(row, col, value, fmt)
-
-    last_row = len(data_rows)
-
-    # Create Radar Chart
-    radar_chart = workbook.add_chart({'type': 'radar'})
-    if radar_chart:
-        for i, (phase, color) in enumerate(zip(PHASES, ['#4472C4', '#ED7D31', '#A5A5A5']), start=1):
-            radar_chart.add_series({
-                'name': phase,
-                'categories': [sheet_name, 1, 0, last_row, 0],
-                'values': [sheet_name, 1, i, last_row, i],
-                'marker': {'type': 'automatic'},
-                'line': {'width': 2.25, 'color': color}
-            })
-
-        radar_chart.set_title({'name': 'Capability Rating by Domain', 'font': {'size': 12, 'bold': True}})
-        radar_chart.set_size({'width': 500, 'height': 300})
-        radar_chart.set_style(2)
-        ws.insert_chart('F2', radar_chart)
-
-    # Create Scatter Chart instead of Bubble Chart
-    scatter_chart = workbook.add_chart({'type': 'scatter'})
-    if scatter_chart:
-        scatter_chart.add_series({
-            'name': 'Domains',
-            'categories': [sheet_name, 1, 1, last_row, 1],  # Plan & Design
-            'values': [sheet_name, 1, 2, last_row, 2],      # Implement
-            'marker': {
-                'type': 'circle',
-                'size': 10,
-                'fill': {'color': '#4472C4'},
-                'border': {'color': '#2F528F'}
-            }
-        })
-
-        scatter_chart.set_title({
-            'name': 'Plan & Design vs Implement',
-            'font': {'size': 12, 'bold': True}
-        })
-        scatter_chart.set_x_axis({
-            'name': 'Plan & Design',
-            'min': 0,
-            'max': 5,
-            'major_gridlines': {'visible': True}
-        })
-        scatter_chart.set_y_axis({
-            'name': 'Implement',
-            'min': 0,
-            'max': 5,
-            'major_gridlines': {'visible': True}
-        })
-        scatter_chart.set_size({'width': 500, 'height': 300})
-        scatter_chart.set_style(2)
-        ws.insert_chart('F20', scatter_chart)
-
-###############################################################################
-# 4. Assessment Form Functions
+# 2. Assessment Form Functions
 ###############################################################################
 
 def get_domain_state_key(domain, phase):
     """Generate a consistent key for storing domain state."""
     return f"{domain}_{phase}"
 
-def save_domain_state(domain, phase_results):
-    """Save the current domain's state to session state."""
+def save_domain_state(domain, phase_results, completed=False):
+    """Save the current domain's state to session state and the store."""
     if domain not in st.session_state.domain_states:
         st.session_state.domain_states[domain] = {}
     
@@ -853,6 +450,16 @@ def save_domain_state(domain, phase_results):
             "comments": data.get("comments", "")
         }
 
+    # Writes are debounced, so calling this on every rerun is cheap
+    if st.session_state.assessment_id is not None:
+        get_assessment_writer().stage(
+            st.session_state.assessment_id,
+            st.session_state.partner_name,
+            domain,
+            dict(st.session_state.domain_states[domain]),
+            completed
+        )
+
 def load_domain_state(domain):
     """Load a domain's saved state from session state."""
     return st.session_state.domain_states.get(domain, {})
@@ -874,16 +481,16 @@ def collect_phase_assessment(phase, current_domain, framework):
         st.session_state[details_key] = saved_phase_data.get("partner_details", "")
 
     # Display the form with saved values
+    texts = level_texts(framework)
     maturity_rating = st.selectbox(
         f"Maturity level for {phase}",
-        options=["1", "2", "3", "4", "5"],
+        options=framework.levels,
         index=int(st.session_state[rating_key]) - 1,  # Convert to 0-based index
-        format_func=lambda x: f"{x} - {framework['maturity_levels'][x]['name']}",
+        format_func=texts.format_label,
         key=rating_key
     )
 
-    bullet_points = MATURITY_LEVELS_DETAILS[maturity_rating]
-    st.markdown("\n".join([f"- {bp}" for bp in bullet_points]), unsafe_allow_html=True)
+    st.markdown(texts.markdown[maturity_rating], unsafe_allow_html=True)
     
     with st.expander("Add Partner Specific Details"):
         partner_details = st.text_area(
@@ -896,9 +503,9 @@ def collect_phase_assessment(phase, current_domain, framework):
     # Return the assessment data
     return {
         "rating": int(maturity_rating),
-        "comments": "\n- ".join([""] + bullet_points),
+        "comments": texts.comments[maturity_rating],
         "partner_details": partner_details,
-        "color": framework["maturity_levels"][maturity_rating]["color"]
+        "color": framework.level_colors[maturity_rating]
     }
 
 def display_assessment_form(framework, current_domain):
@@ -910,22 +517,37 @@ def display_assessment_form(framework, current_domain):
     """, unsafe_allow_html=True)
 
     phase_results = {}
-    cols = st.columns(3)
+    cols = st.columns(len(framework.phases))
 
-    for i, phase in enumerate(PHASES):
+    for i, phase in enumerate(framework.phases):
         with cols[i]:
-            st.markdown(f"""
-                <div class="phase-card">
-                    <h3 style='color: var(--primary-color); margin-bottom: 1rem;'>{phase}</h3>
-                </div>
-            """, unsafe_allow_html=True)
-            phase_results[phase] = collect_phase_assessment(
-                phase, current_domain, framework
-            )
-
-    display_navigation_buttons(current_domain, phase_results)
-
-def display_navigation_buttons(current_domain, phase_results):
+            phase_results[phase] = display_phase_column(phase, current_domain, framework)
+
+    display_navigation_buttons(current_domain, phase_results, framework)
+
+@st.fragment
+def display_phase_column(phase, current_domain, framework):
+    """Display one phase of the form.
+
+    Runs as a fragment: changing a rating reruns only this column, not the
+    page setup, styling or the other phases.
+    """
+    with timer("rerun_phase", "phase_render"):
+        st.markdown(f"""
+            <div class="phase-card">
+                <h3 style='color: var(--primary-color); margin-bottom: 1rem;'>{phase}</h3>
+            </div>
+        """, unsafe_allow_html=True)
+        phase_result = collect_phase_assessment(phase, current_domain, framework)
+
+        # Autosave the ratings as they are entered
+        save_domain_state(current_domain, {phase: phase_result})
+    if not st.session_state.get("full_rerun"):
+        # A rerun of just this fragment ends here
+        commit_session_state()
+    return phase_result
+
+def display_navigation_buttons(current_domain, phase_results, framework):
     """Display and handle navigation buttons with state preservation."""
     col1, col2 = st.columns(2)
     
@@ -933,89 +555,75 @@ def display_navigation_buttons(current_domain, phase_results):
         if st.button("⬅️ Previous"):
             # Save current state before navigating back
             save_domain_state(current_domain, phase_results)
+            get_assessment_writer().flush(st.session_state.assessment_id)
             
             if st.session_state.current_domain_index > 0:
                 st.session_state.current_domain_index -= 1
                 st.rerun()
             elif st.session_state.current_domain_index == 0:
-                st.session_state.partner_name = ""
+                new_assessment(framework)
                 st.rerun()
                 
     with col2:
         if st.button("Save & Continue ➡️"):
-            save_and_continue(current_domain, phase_results)
+            save_and_continue(current_domain, phase_results, framework)
 
-def save_and_continue(current_domain, phase_results):
+def save_and_continue(current_domain, phase_results, framework):
     """Save current assessment and move to next domain."""
     # Save the current domain state
-    save_domain_state(current_domain, phase_results)
+    save_domain_state(current_domain, phase_results, completed=True)
+    get_assessment_writer().flush(st.session_state.assessment_id)
     
-    # Update results while preserving other domains
-    st.session_state.results = [r for r in st.session_state.results 
-                              if r["Domain"] != current_domain]
-    st.session_state.results.append({
-        "Domain": current_domain,
-        **{phase: data for phase, data in phase_results.items()}
-    })
-
-    all_domains = [domain for domains in CATEGORIES.values() for domain in domains]
-    if st.session_state.current_domain_index < len(all_domains) - 1:
+    # Replace this domain's result in place; other domains keep their slots
+    st.session_state.results.set(make_domain_result(current_domain, phase_results, framework))
+
+    if st.session_state.current_domain_index < len(framework.domains) - 1:
         st.session_state.current_domain_index += 1
     else:
+        # Keep the finished assessment as a round of the partner's history
+        get_cohort_store(framework).append(st.session_state.partner_name, st.session_state.results,
+                                           assessment_id=st.session_state.assessment_id)
         st.session_state.show_results = True
     st.rerun()
 
 ###############################################################################
-# 5. Results Page Functions
+# 3. Results Page Functions
 ###############################################################################
 
 def display_results_page(framework, partner_name):
     """Display the results page with all visualizations."""
     st.header("Assessment Results")
-    tab1, tab2, tab3 = st.tabs(["Summary", "Detailed Ratings", "Charts"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Summary", "Detailed Ratings", "Charts", "Progress"])
+    aggregates = st.session_state.results.aggregates
+    store = get_cohort_store(framework)
+    assessment_id = st.session_state.assessment_id
+    # A reopened assessment shows progress up to its own round
+    history = ProgressHistory.from_cohort(store, partner_name, until=assessment_id)
+    if not store.recorded(assessment_id):
+        history = history.with_round(st.session_state.results)
     
     with tab1:
-        display_summary_tab()
+        display_summary_tab(aggregates)
     with tab2:
-        display_detailed_ratings_tab()
+        display_detailed_ratings_tab(framework)
     with tab3:
-        display_charts_tab()
+        display_charts_tab(aggregates)
+    with tab4:
+        display_progress_tab(history)
     
-    display_download_button(framework, partner_name)
+    display_download_button(framework, partner_name, history)
 
-def get_category_for_domain(domain):
-    """Helper to find the category for a given domain."""
-    for cat, domains in CATEGORIES.items():
-        if domain in domains:
-            return cat
-    return "Unknown"
-
-def display_summary_tab():
+def display_summary_tab(aggregates):
     """Display summary tab with color-coded ratings."""
     if not st.session_state.results:
         st.write("No results to display.")
         return
 
-    summary_data = []
-    for res in st.session_state.results:
-        if isinstance(res, pd.Series):
-            summary_data.append({
-                "Category": get_category_for_domain(res.get("Domain")),
-                "Domain": res.get("Domain"),
-                "Plan & Design": res.get(("Plan & Design", "rating")),
-                "Implement": res.get(("Implement", "rating")),
-                "Operate & Improve": res.get(("Operate & Improve", "rating"))
-            })
-        else:
-            summary_data.append({
-                "Category": get_category_for_domain(res["Domain"]),
-                "Domain": res["Domain"],
-                "Plan & Design": res["Plan & Design"]["rating"],
-                "Implement": res["Implement"]["rating"],
-                "Operate & Improve": res["Operate & Improve"]["rating"]
-            })
-    
-    df = pd.DataFrame(summary_data)
+    # Overall average per phase
+    for col, phase in zip(st.columns(len(aggregates.phases)), aggregates.phases):
+        col.metric(f"{phase} (avg)", f"{aggregates.overall[phase]:.2f}")
+
+    df = aggregates.domains
     
     # Color code the numeric columns
     def color_rating(val):
@@ -1026,248 +634,206 @@ def display_summary_tab():
     
     styled_df = df.style.applymap(
         color_rating,
-        subset=PHASES
+        subset=aggregates.phases
     )
     
     st.write(styled_df.to_html(escape=False), unsafe_allow_html=True)
 
-def display_detailed_ratings_tab():
+def display_detailed_ratings_tab(framework):
     """Display detailed ratings with comments."""
     if not st.session_state.results:
         st.write("No detailed results to display.")
         return
 
     for res in st.session_state.results:
-        if isinstance(res, pd.Series):
-            domain = res.get("Domain")
-            with st.expander(f"{domain} ({get_category_for_domain(domain)})"):
-                for phase in PHASES:
-                    rating = res.get((phase, "rating"))
-                    comments = res.get((phase, "comments"))
-                    partner_details = res.get((phase, "partner_details"))
-                    
-                    st.markdown(f"**{phase}:** Level {rating}")
-                    if comments:
-                        st.markdown(comments)
-                    if partner_details:
-                        st.markdown(f"*Partner Details:* {partner_details}")
-        else:
-            with st.expander(f"{res['Domain']} ({get_category_for_domain(res['Domain'])})"):
-                for phase in PHASES:
-                    st.markdown(f"**{phase}:** Level {res[phase]['rating']}")
-                    st.markdown(res[phase]["comments"])
-                    if res[phase].get("partner_details"):
-                        st.markdown(f"*Partner Details:* {res[phase]['partner_details']}")
-
-def display_charts_tab():
+        with st.expander(f"{res.domain} ({res.category})"):
+            for phase, phase_result in zip(framework.phases, res.phases):
+                st.markdown(f"**{phase}:** Level {phase_result.rating}")
+                if phase_result.comments:
+                    st.markdown(phase_result.comments)
+                if phase_result.partner_details:
+                    st.markdown(f"*Partner Details:* {phase_result.partner_details}")
+
+def display_progress_tab(history):
+    """Display rating changes between two assessment rounds and trends across all of them."""
+    if len(history) < 2:
+        st.write("Progress is shown here once this partner has been assessed more than once.")
+        return
+
+    labels = history.labels
+    col1, col2 = st.columns(2)
+    start = col1.selectbox("Compare", range(len(labels)), index=len(labels) - 2,
+                           format_func=labels.__getitem__)
+    end = col2.selectbox("with", range(len(labels)), index=len(labels) - 1,
+                         format_func=labels.__getitem__)
+
+    phase_means = history.phase_means()
+    for col, phase, before, after in zip(st.columns(len(history.framework.phases)),
+                                         history.framework.phases,
+                                         phase_means[start], phase_means[end]):
+        col.metric(f"{phase} (avg)", f"{after:.2f}", f"{after - before:+.2f}")
+
+    st.subheader("Category movement")
+    st.dataframe(history.category_deltas(start, end).round(2), hide_index=True)
+
+    st.subheader("Changed domain ratings")
+    deltas = history.deltas(start, end)
+    changed = deltas[deltas["Change"] != 0]
+    if changed.empty:
+        st.write("No domain rating changed between these rounds.")
+    else:
+        st.dataframe(changed, hide_index=True)
+
+    st.plotly_chart(progress_chart_spec(labels, history.framework.phases, phase_means),
+                    use_container_width=True)
+    with st.expander("Trend per domain (rating change per round)"):
+        st.dataframe(history.trend().dropna(subset=["Slope"]).round(2), hide_index=True)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def display_results_charts(fingerprint, _aggregates):
+    """Render the results charts once per distinct set of ratings.
+
+    Later reruns replay the cached chart elements, skipping both building
+    the figures and serializing them.
+    """
+    for spec in results_chart_specs(_aggregates):
+        st.plotly_chart(spec, use_container_width=True)
+
+def display_charts_tab(aggregates):
     """Display enhanced interactive charts in the UI."""
     try:
         if not st.session_state.results:
             st.write("No charts to display.")
             return
 
-        # Prepare data for charts
-        domain_data = []
-        for res in st.session_state.results:
-            try:
-                if isinstance(res, pd.Series):
-                    domain = res.get("Domain")
-                    category = get_category_for_domain(domain)
-                    domain_data.append({
-                        "Domain": domain,
-                        "Category": category,
-                        "Plan & Design": res.get(("Plan & Design", "rating"), 0),
-                        "Implement": res.get(("Implement", "rating"), 0),
-                        "Operate & Improve": res.get(("Operate & Improve", "rating"), 0)
-                    })
-                else:
-                    domain_data.append({
-                        "Domain": res["Domain"],
-                        "Category": get_category_for_domain(res["Domain"]),
-                        "Plan & Design": res["Plan & Design"]["rating"],
-                        "Implement": res["Implement"]["rating"],
-                        "Operate & Improve": res["Operate & Improve"]["rating"]
-                    })
-            except Exception as e:
-                st.warning(f"Error processing result: {str(e)}")
-                continue
-
-        if not domain_data:
-            st.warning("No valid data available for charts.")
-            return
-
-        df_domain = pd.DataFrame(domain_data)
-        
-        # Create Domain Level Maturity Ratings chart
-        fig_domain = go.Figure()
-        colors = ['#4472C4', '#ED7D31', '#A5A5A5']  # Blue, Orange, Gray
-        
-        for phase, color in zip(PHASES, colors):
-            fig_domain.add_trace(go.Bar(
-                name=phase,
-                x=df_domain["Domain"],
-                y=df_domain[phase],
-                marker_color=color
-            ))
-
-        fig_domain.update_layout(
-            title={
-                'text': "Domain Level Maturity Ratings",
-                'y':0.95,
-                'x':0.5,
-                'xanchor': 'center',
-                'yanchor': 'top',
-                'font': dict(size=20, color='#003366')
-            },
-            barmode='group',
-            xaxis_title="Domains",
-            yaxis_title="Rating",
-            yaxis=dict(range=[0, 5]),
-            plot_bgcolor='rgba(240,240,240,0.8)',
-            paper_bgcolor='rgba(240,240,240,0.8)',
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-        
-        st.plotly_chart(fig_domain, use_container_width=True)
-
-        # Create Category Level Maturity Ratings chart
-        df_category = df_domain.groupby('Category')[PHASES].mean().reset_index()
-        
-        fig_category = go.Figure()
-        
-        for phase, color in zip(PHASES, colors):
-            fig_category.add_trace(go.Bar(
-                name=phase,
-                x=df_category["Category"],
-                y=df_category[phase],
-                marker_color=color
-            ))
-        
-        fig_category.update_layout(
-            title={
-                'text': "Category Level Maturity Ratings",
-                'y':0.95,
-                'x':0.5,
-                'xanchor': 'center',
-                'yanchor': 'top',
-                'font': dict(size=20, color='#003366')
-            },
-            barmode='group',
-            xaxis_title="Categories",
-            yaxis_title="Rating",
-            yaxis=dict(range=[0, 5]),
-            plot_bgcolor='rgba(240,240,240,0.8)',
-            paper_bgcolor='rgba(240,240,240,0.8)',
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-        
-        st.plotly_chart(fig_category, use_container_width=True)
-
-        # Create enhanced Radar Chart
-        fig_radar = go.Figure()
-        
-        for phase, color in zip(PHASES, colors):
-            fig_radar.add_trace(go.Scatterpolar(
-                r=df_domain[phase],
-                theta=df_domain["Domain"],
-                name=phase,
-                fill='toself',
-                line=dict(color=color, width=2),
-                fillcolor=f'rgba{tuple(list(int(color.lstrip("#")[i:i+2], 16) for i in (0, 2, 4)) + [0.2])}'
-            ))
-        
-        fig_radar.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 5],
-                    gridcolor='rgba(0,0,0,0.1)',
-                    linecolor='rgba(0,0,0,0.1)'
-                ),
-                bgcolor='rgba(240,240,240,0.8)',
-                angularaxis=dict(gridcolor='rgba(0,0,0,0.1)')
-            ),
-            showlegend=True,
-            title={
-                'text': "Domain Maturity Overview",
-                'y':0.95,
-                'x':0.5,
-                'xanchor': 'center',
-                'yanchor': 'top',
-                'font': dict(size=20, color='#003366')
-            },
-            paper_bgcolor='rgba(240,240,240,0.8)',
-            plot_bgcolor='rgba(240,240,240,0.8)'
-        )
-        
-        st.plotly_chart(fig_radar, use_container_width=True)
+        # Domain bar chart, category bar chart and radar chart
+        display_results_charts(ratings_fingerprint(aggregates), aggregates)
 
     except Exception as e:
         st.error(f"Error displaying charts: {str(e)}")
 
-def display_download_button(framework, partner_name):
-    """Display Excel download button."""
+def get_results_fingerprint(results, partner_name, history=None):
+    """Return a content hash identifying the given results (and history) for a partner."""
+    rounds = None
+    if history is not None and len(history) >= 2:
+        # Rounds as the report labels them: an unrecorded latest round is
+        # stamped with the current time, which changes on every rerun
+        rounds = [history.labels, history.ratings.tolist()]
+    payload = json.dumps(
+        {"partner_name": partner_name, "results": [res.to_dict() for res in results],
+         "rounds": rounds},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def get_cached_report(fingerprint):
+    """Return the finished Excel report bytes for a fingerprint, if any."""
+    report = st.session_state.report_cache.get(fingerprint)
+    if report is None:
+        queue = get_report_queue()
+        job = queue.get(fingerprint)
+        if job is not None and job.status == DONE:
+            report = queue.read(job)
+            # Only the current results are worth keeping; older reports are stale
+            st.session_state.report_cache = {fingerprint: report}
+    return report
+
+def display_download_button(framework, partner_name, history=None):
+    """Display Excel download button, building the report in the background on request."""
     if not st.session_state.results:
         st.write("No data available for download.")
         return
 
-    # Sanitize partner name for filename
-    sanitized_filename = "".join(c for c in partner_name if c.isalnum() or c in (' ', '-', '_')).strip()
-    if not sanitized_filename:
-        sanitized_filename = "AI_Maturity_Assessment"
-    
-    excel_file = create_excel_workbook(
-        st.session_state.results,
-        framework,
-        partner_name
-    )
-    
-    st.download_button(
-        "📥 Download Full Assessment Report (Excel)",
-        excel_file,
-        f"{sanitized_filename}_AI_Maturity_Assessment_Report.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    fingerprint = get_results_fingerprint(st.session_state.results, partner_name, history)
+    job = get_report_queue().get(fingerprint)
+    polling = (get_cached_report(fingerprint) is None and job is not None
+               and job.status not in (DONE, FAILED))
+    # While the report builds only this fragment reruns, so the page stays usable
+    st.fragment(display_report_status, run_every=0.5 if polling else None)(
+        framework, partner_name, history, fingerprint, polling)
+
+def display_report_status(framework, partner_name, history, fingerprint, polling):
+    """Display the download button, the build status or the Generate button."""
+    queue = get_report_queue()
+    report = get_cached_report(fingerprint)
+    job = queue.get(fingerprint)
+    if polling and (report is not None or job is None or job.status in (DONE, FAILED)):
+        # The build finished; rerun the page to stop polling
+        st.rerun()
+
+    if report is not None:
+        st.download_button(
+            "📥 Download Full Assessment Report (Excel)",
+            report,
+            report_filename(partner_name),
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+    elif job is None or job.status == FAILED:
+        if job is not None:
+            st.error(f"Error creating Excel workbook: {job.error}")
+        if st.button("📄 Generate Excel Report"):
+            try:
+                queue.submit(fingerprint, st.session_state.results, framework, partner_name,
+                             history)
+            except JobQueueFull:
+                st.warning("The server is busy generating other reports. Please try again shortly.")
+                return
+            st.rerun()
+    else:
+        st.info("⏳ Generating report...")
 
 ###############################################################################
-# 6. Main Application
+# 4. Main Application
 ###############################################################################
 
 def main():
     """Main application flow."""
-    init_session_state()
-    setup_page()
-    framework = load_config()
-    
-    # Handle partner name input
-    if not st.session_state.partner_name:
-        partner_name = st.text_input("Enter Partner Name:", key="partner_name_input")
-        if not partner_name:
+    start_metrics_server()
+    st.session_state.full_rerun = True
+    try:
+        run_page()
+    finally:
+        st.session_state.full_rerun = False
+        commit_session_state()
+
+def run_page():
+    """Render the page for the current session state."""
+    with REGISTRY.profile("rerun"):
+        with timer("rerun_phase", "setup"):
+            setup_page()
+        if debug_enabled():
+            display_debug_panel()
+
+        try:
+            with timer("rerun_phase", "config_load"):
+                framework = load_config()
+        except FrameworkError as e:
+            st.error(str(e))
+            st.stop()
+        with timer("rerun_phase", "setup"):
+            init_session_state(framework)
+
+        # Handle partner name input
+        if not st.session_state.partner_name:
+            partner_name = st.text_input("Enter Partner Name:", key="partner_name_input")
+            display_import_option(framework)
+            if partner_name:
+                start_assessment(partner_name, framework)
+        display_workspace_sidebar(framework)
+        if not st.session_state.partner_name:
             st.warning("Please enter partner name to continue")
             st.stop()
-        st.session_state.partner_name = partner_name
-    
-    # Display either results or assessment form
-    if st.session_state.show_results:
-        display_results_page(framework, st.session_state.partner_name)
-    else:
-        all_domains = [domain for domains in CATEGORIES.values() for domain in domains]
-        current_domain = all_domains[st.session_state.current_domain_index]
-        display_assessment_form(framework, current_domain)
+
+        # Display either results or assessment form
+        if st.session_state.show_results:
+            with timer("rerun_phase", "results_render"):
+                display_results_page(framework, st.session_state.partner_name)
+        else:
+            index = min(st.session_state.current_domain_index, len(framework.domains) - 1)
+            current_domain = framework.domains[index]
+            with timer("rerun_phase", "form_render"):
+                display_assessment_form(framework, current_domain)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""Benchmarks for report generation and results page data preparation.
+
+Times every Excel sheet builder separately, the full report and the data the
+results tabs are built from, for synthetic assessments with 10 and 100
+domains, plus streamed portfolio exports of 1k and 10k partners. Peak
+memory (traced Python allocations) is recorded per case. Run from the
+repository root::
+
+    python -m benchmarks.bench_reports            # compare with baseline.json
+    python -m benchmarks.bench_reports --save     # record a new baseline
+
+A benchmark is flagged as a regression when it is slower or uses more memory
+than its baseline by more than the tolerance; the exit status is then 1.
+Baselines are machine specific, so record one on the machine you compare on.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import xlsxwriter
+
+from maturity.aggregate import aggregate_ratings
+from maturity.charts import results_chart_specs
+from maturity.excel import (
+    create_charts_sheet,
+    create_comments_sheet,
+    create_definitions_sheet,
+    create_excel_workbook,
+    create_heatmap_sheet,
+    create_partner_details_sheet,
+    create_portfolio_workbook,
+    create_ratings_sheet,
+    get_formats,
+)
+from maturity.framework import FRAMEWORK_PATH, compile_framework
+from maturity.model import normalize_results
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Differences below this many seconds are timer noise, never regressions
+MIN_SECONDS_DELTA = 0.002
+
+def synthetic_framework(domain_count):
+    """Build the default framework with ``domain_count`` domains over its categories."""
+    with open(FRAMEWORK_PATH, 'r') as f:
+        data = json.load(f)
+    categories = list(data["categories"])
+    template = next(iter(data["domains"].values()))
+    data["categories"] = {category: [] for category in categories}
+    data["domains"] = {}
+    for i in range(domain_count):
+        domain = f"Domain {i + 1:03d}"
+        data["categories"][categories[i % len(categories)]].append(domain)
+        data["domains"][domain] = template
+    return compile_framework(data, f"<synthetic {domain_count} domains>")
+
+def synthetic_results(framework, seed=0):
+    """Build completed results for every domain of ``framework`` as plain dicts."""
+    levels = len(framework.levels)
+    results = []
+    for i, domain in enumerate(framework.domains):
+        phase_results = {}
+        for j, phase in enumerate(framework.phases):
+            rating = (seed + i + j) % levels + 1
+            phase_results[phase] = {
+                "rating": rating,
+                "comments": "\n- " + "\n- ".join(framework.level_details[str(rating)][:3]),
+                "partner_details": f"Notes for {domain}, {phase}" if j == 1 else "",
+                "color": framework.rating_color(rating)
+            }
+        results.append({"Domain": domain, **phase_results})
+    return results
+
+def synthetic_assessments(framework, count):
+    """Yield ``count`` synthetic portfolio records one at a time."""
+    for seed in range(count):
+        yield {"partner_name": f"Partner {seed:05d}", "results": synthetic_results(framework, seed)}
+
+def measure(func, repeat):
+    """Return the median seconds of ``func()`` over ``repeat`` runs and its peak KiB."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": statistics.median(times), "peak_kib": peak // 1024}
+
+def sheet_builders(results, aggregates, framework):
+    """Map each sheet name to a function building it into a given workbook."""
+    return {
+        "partner_details": lambda wb: create_partner_details_sheet(wb, "Benchmark Partner"),
+        "ratings": lambda wb: create_ratings_sheet(wb, results, framework, "Ratings"),
+        "heatmap": lambda wb: create_heatmap_sheet(wb, aggregates, "Heatmap"),
+        "comments": lambda wb: create_comments_sheet(wb, results, "Comments", framework),
+        "definitions": lambda wb: create_definitions_sheet(wb, "Definitions", framework),
+        "charts": lambda wb: create_charts_sheet(wb, aggregates, "Charts"),
+    }
+
+def bench_sheet(build, framework):
+    """Return a callable building one sheet into a fresh in-memory workbook."""
+    def run():
+        workbook = xlsxwriter.Workbook(io.BytesIO())
+        get_formats(workbook, framework)
+        build(workbook)
+        workbook.close()
+    return run
+
+def report_benchmarks(domain_count, repeat):
+    """Benchmark one partner's report and results page data for a domain count."""
+    framework = synthetic_framework(domain_count)
+    raw_results = synthetic_results(framework)
+    results = normalize_results(raw_results, framework)
+    aggregates = aggregate_ratings(results, framework)
+
+    prefix = f"report_{domain_count}_domains"
+    # Sheet timings include opening and saving a workbook; this is that fixed cost
+    benchmarks = {f"{prefix}/empty_workbook": measure(bench_sheet(lambda wb: None, framework), repeat)}
+    for name, build in sheet_builders(results, aggregates, framework).items():
+        benchmarks[f"{prefix}/sheet_{name}"] = measure(bench_sheet(build, framework), repeat)
+    benchmarks[f"{prefix}/workbook"] = measure(
+        lambda: create_excel_workbook(raw_results, framework, "Benchmark Partner"), repeat)
+    benchmarks[f"{prefix}/workbook_streaming"] = measure(
+        lambda: create_excel_workbook(raw_results, framework, "Benchmark Partner", streaming=True),
+        repeat)
+    benchmarks[f"{prefix}/normalize_results"] = measure(
+        lambda: normalize_results(raw_results, framework), repeat)
+    benchmarks[f"{prefix}/aggregate_ratings"] = measure(
+        lambda: aggregate_ratings(results, framework), repeat)
+    benchmarks[f"{prefix}/chart_specs"] = measure(lambda: results_chart_specs(aggregates), repeat)
+    return benchmarks
+
+def portfolio_benchmark(partner_count, repeat):
+    """Benchmark a streamed portfolio export of ``partner_count`` partners."""
+    framework = synthetic_framework(10)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "portfolio.xlsx")
+        return {f"portfolio_{partner_count}_partners/export": measure(
+            lambda: create_portfolio_workbook(synthetic_assessments(framework, partner_count),
+                                              path, framework),
+            repeat)}
+
+def run_benchmarks(repeat=5, quick=False):
+    """Run every benchmark and return ``{name: {"seconds", "peak_kib"}}``."""
+    benchmarks = {}
+    for domain_count in (10, 100):
+        benchmarks.update(report_benchmarks(domain_count, repeat))
+    for partner_count in ((1000,) if quick else (1000, 10000)):
+        benchmarks.update(portfolio_benchmark(partner_count, 1))
+    return benchmarks
+
+def compare(results, baseline, tolerance, memory_tolerance):
+    """Return a list of regression messages for ``results`` against ``baseline``."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        seconds, base_seconds = current["seconds"], previous["seconds"]
+        if seconds > base_seconds * (1 + tolerance) and seconds - base_seconds > MIN_SECONDS_DELTA:
+            regressions.append(f"{name}: {seconds * 1000:.1f} ms vs {base_seconds * 1000:.1f} ms")
+        peak, base_peak = current["peak_kib"], previous["peak_kib"]
+        if peak > base_peak * (1 + memory_tolerance):
+            regressions.append(f"{name}: peak {peak} KiB vs {base_peak} KiB")
+    return regressions
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark report generation.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results as the baseline")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--quick", action="store_true", help="skip the 10k partner export")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline (default: 0.25)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10,
+                        help="allowed peak memory growth as a fraction (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.repeat, args.quick)
+    for name, result in results.items():
+        print(f"{name:<52} {result['seconds'] * 1000:10.2f} ms {result['peak_kib']:10d} KiB")
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "benchmarks": results
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save to record one", file=sys.stderr)
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)["benchmarks"]
+    regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    if not regressions:
+        print("No regressions against the baseline")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
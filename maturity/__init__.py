@@ -0,0 +1 @@
+"""Streamlit-free core of the AI Maturity Assessment tool."""
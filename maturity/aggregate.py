@@ -0,0 +1,45 @@
+"""Domain, category and overall rating aggregation.
+
+All results views and report sheets read their tables from a single
+``RatingAggregates`` built by ``aggregate_ratings``, instead of each one
+re-scanning the results to average categories.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from maturity.framework import default_framework
+from maturity.model import ratings_frame
+
+@dataclass(frozen=True, slots=True)
+class RatingAggregates:
+    """Per-phase ratings at domain, category and overall level."""
+    phases: list              # Phase names, the rating columns of both frames
+    domains: pd.DataFrame     # Category, Domain and one column per phase
+    categories: pd.DataFrame  # Category and the mean rating per phase
+    overall: dict             # Phase name -> mean rating across all domains
+
+def aggregate_ratings(results, framework=None):
+    """Compute domain, category and overall means per phase in one pass.
+
+    Categories keep the order in which they first appear in ``results``.
+    """
+    phases = list((framework or default_framework()).phases)
+    domains = ratings_frame(results, framework)
+    ratings = domains[phases].to_numpy(dtype=float)
+
+    codes, names = pd.factorize(domains["Category"])
+    counts = np.bincount(codes, minlength=len(names))
+    sums = np.zeros((len(names), len(phases)))
+    np.add.at(sums, codes, ratings)
+    means = sums / counts[:, None] if len(names) else sums
+
+    categories = pd.DataFrame(means, columns=phases)
+    categories.insert(0, "Category", list(names))
+
+    overall_means = ratings.mean(axis=0) if len(ratings) else np.zeros(len(phases))
+    overall = dict(zip(phases, overall_means.tolist()))
+
+    return RatingAggregates(phases=phases, domains=domains, categories=categories, overall=overall)
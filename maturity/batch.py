@@ -0,0 +1,155 @@
+"""Headless batch generation of partner reports.
+
+Reads completed assessments from a directory of ``*.json`` files or from a
+single ``.jsonl`` file and writes one Excel report per partner, e.g.::
+
+    python -m maturity.batch assessments.jsonl -o reports --workers 8
+
+Each assessment is a JSON object of the form
+``{"partner_name": "...", "results": [...]}`` where ``results`` has the same
+shape the app builds in ``save_and_continue``. Reports that already exist in
+the output directory are skipped, so an interrupted run can simply be
+restarted; pass ``--force`` to regenerate everything.
+
+``--portfolio FILE`` instead streams the ratings and comments of every
+partner into a single workbook with constant memory use.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from maturity.excel import create_excel_workbook, create_portfolio_workbook, report_filename
+from maturity.framework import FRAMEWORK_PATH, load_config
+
+_framework = None
+
+def iter_assessments(source):
+    """Yield assessment records from a directory of JSON files or a JSONL file."""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith('.json'):
+                with open(os.path.join(source, name), 'r') as f:
+                    yield json.load(f)
+    else:
+        with open(source, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+def latest_assessments(source):
+    """Yield the last record of each partner in ``source``, in source order.
+
+    Sources are appended to as partners are re-assessed, so a partner's last
+    record is their latest round. ``source`` is read twice rather than held
+    in memory.
+    """
+    last = {}
+    for i, record in enumerate(iter_assessments(source)):
+        last[record["partner_name"]] = i
+    keep = set(last.values())
+    for i, record in enumerate(iter_assessments(source)):
+        if i in keep:
+            yield record
+
+def _init_worker(framework_path):
+    """Load the framework once per worker process."""
+    global _framework
+    _framework = load_config(framework_path)
+
+def build_report(record, output_dir):
+    """Write one partner's report atomically and return its path."""
+    partner_name = record["partner_name"]
+    path = os.path.join(output_dir, report_filename(partner_name))
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.partial-{os.getpid()}{ext}"
+    try:
+        create_excel_workbook(record["results"], _framework, partner_name, tmp_path)
+        # Only complete reports ever appear under the final name, which is
+        # what makes skipping existing files safe when resuming
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+def generate_reports(source, output_dir, framework_path=FRAMEWORK_PATH, workers=None, force=False):
+    """Generate reports for all assessments in ``source``.
+
+    Returns a ``(written, skipped, failed)`` tuple of counts.
+    """
+    # Fail fast on a bad framework file rather than in every worker
+    load_config(framework_path)
+    os.makedirs(output_dir, exist_ok=True)
+
+    pending = []
+    seen = set()
+    skipped = 0
+    for record in iter_assessments(source):
+        filename = report_filename(record["partner_name"])
+        if filename in seen:
+            print(f"Skipping duplicate partner: {record['partner_name']}", file=sys.stderr)
+            skipped += 1
+            continue
+        seen.add(filename)
+        if not force and os.path.exists(os.path.join(output_dir, filename)):
+            skipped += 1
+            continue
+        pending.append(record)
+
+    written = failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(framework_path,)) as pool:
+        futures = {pool.submit(build_report, record, output_dir): record["partner_name"]
+                   for record in pending}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                written += 1
+            except Exception as e:
+                failed += 1
+                print(f"Failed to build report for {futures[future]}: {e}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"Wrote {written} reports in {elapsed:.2f}s ({rate:.1f} reports/s), "
+          f"skipped {skipped}, failed {failed}")
+    return written, skipped, failed
+
+def export_portfolio(source, path, framework_path=FRAMEWORK_PATH):
+    """Stream each partner's latest assessment in ``source`` into one workbook at ``path``."""
+    framework = load_config(framework_path)
+    start = time.perf_counter()
+    count = create_portfolio_workbook(latest_assessments(source), path, framework)
+    print(f"Exported {count} partners to {path} in {time.perf_counter() - start:.2f}s")
+    return count
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate AI maturity reports for many partners.")
+    parser.add_argument("source", help="directory of .json assessments or a .jsonl file")
+    parser.add_argument("-o", "--output-dir", default="reports", help="where to write the reports")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--framework", default=FRAMEWORK_PATH, help="framework JSON file")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate reports that already exist")
+    parser.add_argument("--portfolio", metavar="FILE",
+                        help="write all partners into one streamed workbook instead")
+    args = parser.parse_args(argv)
+
+    if args.portfolio:
+        export_portfolio(args.source, args.portfolio, args.framework)
+        return 0
+
+    _, _, failed = generate_reports(args.source, args.output_dir, args.framework,
+                                    args.workers, args.force)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
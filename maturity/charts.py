@@ -0,0 +1,143 @@
+"""Plotly figure specs for the results page charts.
+
+Figures are built as plain ``{"data": ..., "layout": ...}`` dicts, which is
+what Streamlit sends to the browser, so building them needs neither plotly
+nor a ``go.Figure`` round-trip. Colors and layout templates are computed
+once at import.
+"""
+
+import hashlib
+import json
+
+from maturity.templates import PHASE_COLORS
+
+def _rgba(hex_color, alpha):
+    """Convert '#RRGGBB' to a plotly 'rgba(r, g, b, a)' string."""
+    r, g, b = (int(hex_color.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4))
+    return f'rgba{(r, g, b, alpha)}'
+
+PHASE_FILL_COLORS = [_rgba(color, 0.2) for color in PHASE_COLORS]
+
+BACKGROUND = 'rgba(240,240,240,0.8)'
+
+TITLE_STYLE = {
+    'y': 0.95,
+    'x': 0.5,
+    'xanchor': 'center',
+    'yanchor': 'top',
+    'font': {'size': 20, 'color': '#003366'}
+}
+
+BAR_LAYOUT = {
+    'barmode': 'group',
+    'plot_bgcolor': BACKGROUND,
+    'paper_bgcolor': BACKGROUND,
+    'showlegend': True,
+    'legend': {
+        'orientation': 'h',
+        'yanchor': 'bottom',
+        'y': 1.02,
+        'xanchor': 'right',
+        'x': 1
+    }
+}
+
+RADAR_LAYOUT = {
+    'polar': {
+        'radialaxis': {
+            'visible': True,
+            'range': [0, 5],
+            'gridcolor': 'rgba(0,0,0,0.1)',
+            'linecolor': 'rgba(0,0,0,0.1)'
+        },
+        'bgcolor': BACKGROUND,
+        'angularaxis': {'gridcolor': 'rgba(0,0,0,0.1)'}
+    },
+    'showlegend': True,
+    'paper_bgcolor': BACKGROUND,
+    'plot_bgcolor': BACKGROUND
+}
+
+def ratings_fingerprint(aggregates):
+    """Hash the ratings behind a ``RatingAggregates`` for caching figures."""
+    payload = json.dumps([aggregates.phases, aggregates.domains.values.tolist()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def bar_chart_spec(df, label_column, phases, title, axis_title):
+    """Grouped bar chart with one series per phase."""
+    labels = df[label_column].tolist()
+    return {
+        'data': [
+            {
+                'type': 'bar',
+                'name': phase,
+                'x': labels,
+                'y': df[phase].tolist(),
+                'marker': {'color': color}
+            }
+            for phase, color in zip(phases, PHASE_COLORS)
+        ],
+        'layout': {
+            **BAR_LAYOUT,
+            'title': {**TITLE_STYLE, 'text': title},
+            'xaxis': {'title': {'text': axis_title}},
+            'yaxis': {'title': {'text': "Rating"}, 'range': [0, 5]}
+        }
+    }
+
+def radar_chart_spec(df, phases):
+    """Filled radar chart of domain ratings with one trace per phase."""
+    domains = df["Domain"].tolist()
+    return {
+        'data': [
+            {
+                'type': 'scatterpolar',
+                'r': df[phase].tolist(),
+                'theta': domains,
+                'name': phase,
+                'fill': 'toself',
+                'line': {'color': color, 'width': 2},
+                'fillcolor': fill_color
+            }
+            for phase, color, fill_color in zip(phases, PHASE_COLORS, PHASE_FILL_COLORS)
+        ],
+        'layout': {
+            **RADAR_LAYOUT,
+            'title': {**TITLE_STYLE, 'text': "Domain Maturity Overview"}
+        }
+    }
+
+def results_chart_specs(aggregates):
+    """Specs for the domain bar, category bar and radar charts, in display order."""
+    return [
+        bar_chart_spec(aggregates.domains, "Domain", aggregates.phases,
+                       "Domain Level Maturity Ratings", "Domains"),
+        bar_chart_spec(aggregates.categories, "Category", aggregates.phases,
+                       "Category Level Maturity Ratings", "Categories"),
+        radar_chart_spec(aggregates.domains, aggregates.phases),
+    ]
+
+def progress_chart_spec(labels, phases, phase_means):
+    """Line chart of the average rating per phase across assessment rounds."""
+    return {
+        'data': [
+            {
+                'type': 'scatter',
+                'mode': 'lines+markers',
+                'name': phase,
+                'x': labels,
+                'y': [None if mean != mean else mean for mean in phase_means[:, i].tolist()],
+                'line': {'color': color, 'width': 2}
+            }
+            for i, (phase, color) in enumerate(zip(phases, PHASE_COLORS))
+        ],
+        'layout': {
+            'plot_bgcolor': BACKGROUND,
+            'paper_bgcolor': BACKGROUND,
+            'showlegend': True,
+            'legend': BAR_LAYOUT['legend'],
+            'title': {**TITLE_STYLE, 'text': "Average Rating by Round"},
+            'xaxis': {'title': {'text': "Round"}},
+            'yaxis': {'title': {'text': "Rating"}, 'range': [0, 5]}
+        }
+    }
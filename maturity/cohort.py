@@ -0,0 +1,409 @@
+"""Append-only, memory-mapped columnar store of every assessment ever taken.
+
+A ``CohortStore`` is a directory of fixed-width column files, one row per
+assessment:
+
+* ``<n>.u8`` per domain and phase - the rating, 0 where not assessed,
+* ``timestamps.f8`` - when the assessment was taken (seconds since the epoch),
+* ``partners.i4`` - the partner's position in ``partners.jsonl``,
+* ``assessments.S32`` - the app's assessment ID, empty for other sources,
+
+plus ``columns.json`` naming the domain and phase of each rating column.
+Columns are memory-mapped for queries, so a cross-partner question is a
+vectorized scan of the one or two columns it needs, and memory use does not
+grow with the cohort::
+
+    store = CohortStore("cohort")
+    store.append("Acme", results)
+    store.mean_rating("AI Deployment & MLOps", "Implement", *quarter(2025, 3))
+
+Columns are matched by name: when the framework gains a domain or phase, its
+columns are added (zero for earlier rows) and retired ones stay readable.
+Appends from several processes are serialized with a lock file (on POSIX
+systems; elsewhere only one process may append); any number may read.
+``partners.i4`` is written last, so readers only ever see whole rows, and
+partner names are re-read whenever a row names a partner not seen yet.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from maturity.batch import iter_assessments
+from maturity.framework import FRAMEWORK_PATH, default_framework, load_config
+from maturity.model import ratings_array
+
+DEFAULT_COHORT_DIR = os.environ.get("AI_MATURITY_COHORT_DIR", "cohort")
+
+_TIMESTAMPS = "timestamps.f8"
+_PARTNER_IDS = "partners.i4"
+_ASSESSMENT_IDS = "assessments.S32"
+_ASSESSMENT_ID_WIDTH = 32
+_PARTNER_NAMES = "partners.jsonl"
+_COLUMNS = "columns.json"
+_LOCK = ".lock"
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+def quarter(year, q):
+    """Return the ``(start, end)`` datetimes of a calendar quarter, end exclusive."""
+    start = datetime(year, 3 * q - 2, 1, tzinfo=timezone.utc)
+    end = datetime(year + q // 4, 3 * q % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+def _epoch(value):
+    """Seconds since the epoch of a datetime, date, ISO string or number."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp()
+    return float(value)
+
+class CohortStore:
+    """Assessments of every partner over time, stored column by column."""
+
+    def __init__(self, directory, framework=None):
+        self.directory = directory
+        self.framework = framework or default_framework()
+        self._lock = threading.RLock()
+        self._maps = {}
+        os.makedirs(directory, exist_ok=True)
+
+        self.partners = []
+        self._partner_index = {}
+        self._partners_read = 0
+        self._reload_partners()
+
+        self.columns = []
+        self._column_index = {}
+        with self._append_lock():
+            self._sync_columns(register=True)
+        # Framework domain x phase -> column, to scatter a ratings row
+        self._layout = np.array([
+            [self._column_index[domain, phase] for phase in self.framework.phases]
+            for domain in self.framework.domains
+        ], dtype=np.intp)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _column_path(self, i):
+        return self._path(f"{i}.u8")
+
+    def _sync_columns(self, register=False):
+        """Re-read ``columns.json`` and bring every column file up to the row count.
+
+        With ``register``, columns of this store's framework that are missing
+        are added. Call with the append lock held.
+        """
+        path = self._path(_COLUMNS)
+        columns = []
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                columns = [tuple(column) for column in json.load(f)]
+        added = []
+        if register:
+            added = [(domain, phase) for domain in self.framework.domains
+                     for phase in self.framework.phases if (domain, phase) not in columns]
+        columns.extend(added)
+        if added or not os.path.exists(path):
+            with open(path + ".tmp", 'w') as f:
+                json.dump(columns, f)
+            os.replace(path + ".tmp", path)
+        self.columns = columns
+        self._column_index = {column: i for i, column in enumerate(columns)}
+
+        # Rows written before a column existed were not assessed on it
+        rows = len(self)
+        sizes = {self._column_path(i): rows for i in range(len(columns))}
+        sizes[self._path(_ASSESSMENT_IDS)] = _ASSESSMENT_ID_WIDTH * rows
+        for column_path, size in sizes.items():
+            if not os.path.exists(column_path) or os.path.getsize(column_path) < size:
+                with open(column_path, 'ab') as f:
+                    f.truncate(size)
+
+    def _reload_partners(self):
+        """Read partner names other processes have registered since the last read."""
+        path = self._path(_PARTNER_NAMES)
+        with self._lock:
+            if not os.path.exists(path) or os.path.getsize(path) == self._partners_read:
+                return
+            with open(path, 'rb') as f:
+                f.seek(self._partners_read)
+                data = f.read()
+            # A name still being written has no newline yet; it is read next time
+            complete = data[:data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if line.strip():
+                    name = json.loads(line)
+                    self._partner_index[name] = len(self.partners)
+                    self.partners.append(name)
+            self._partners_read += len(complete)
+
+    @contextmanager
+    def _append_lock(self):
+        """Hold this store's thread lock and, where supported, its file lock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._path(_LOCK), 'a') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _truncate(self):
+        """Cut off rows an interrupted append left half written. Call with the append lock held."""
+        rows = len(self)
+        sizes = {self._path(_TIMESTAMPS): 8 * rows,
+                 self._path(_ASSESSMENT_IDS): _ASSESSMENT_ID_WIDTH * rows}
+        sizes.update({self._column_path(i): rows for i in range(len(self.columns))})
+        for path, size in sizes.items():
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def __len__(self):
+        path = self._path(_PARTNER_IDS)
+        return os.path.getsize(path) // 4 if os.path.exists(path) else 0
+
+    def append(self, partner_name, results, timestamp=None, assessment_id=None):
+        """Append one assessment of a partner, taken at ``timestamp`` (default: now)."""
+        row = ratings_array(results, self.framework)
+        self.append_ratings([partner_name], row[None], [timestamp], [assessment_id])
+
+    def append_snapshot(self, snapshot, timestamp=None, assessment_id=None):
+        """Append the completed, fully rated domains of a ``Snapshot``."""
+        row = snapshot.aligned_ratings(self.framework)
+        completed = np.array([domain in snapshot.completed for domain in self.framework.domains])
+        row[~(completed & (row > 0).all(axis=1))] = 0
+        self.append_ratings([snapshot.partner_name], row[None], [timestamp], [assessment_id])
+
+    def extend(self, records):
+        """Append ``{"partner_name", "results"[, "assessed_at", "assessment_id"]}`` records in one write."""
+        names, rows, timestamps, assessment_ids = [], [], [], []
+        for record in records:
+            names.append(record["partner_name"])
+            rows.append(ratings_array(record["results"], self.framework))
+            timestamps.append(record.get("assessed_at"))
+            assessment_ids.append(record.get("assessment_id"))
+        if rows:
+            self.append_ratings(names, np.stack(rows), timestamps, assessment_ids)
+        return len(rows)
+
+    def append_ratings(self, partner_names, ratings, timestamps=None, assessment_ids=None):
+        """Append rows of framework-shaped ``ratings`` (rows x domains x phases)."""
+        ratings = np.asarray(ratings)
+        if ((ratings < 0) | (ratings > len(self.framework.levels))).any():
+            raise ValueError("Ratings must be between 0 and the highest maturity level")
+        now = datetime.now(timezone.utc).timestamp()
+        if timestamps is None:
+            timestamps = [None] * len(ratings)
+        timestamps = np.array([now if t is None else _epoch(t) for t in timestamps], dtype='<f8')
+        if assessment_ids is None:
+            assessment_ids = [None] * len(ratings)
+        assessment_ids = [(a or "").encode("ascii") for a in assessment_ids]
+        if any(len(a) > _ASSESSMENT_ID_WIDTH for a in assessment_ids):
+            raise ValueError(f"Assessment IDs must be at most {_ASSESSMENT_ID_WIDTH} characters")
+        assessment_ids = np.array(assessment_ids, dtype=f'S{_ASSESSMENT_ID_WIDTH}')
+
+        with self._append_lock():
+            self._reload_partners()
+            self._sync_columns()
+            self._truncate()
+            partner_ids = np.array(
+                [self._partner_id(name) for name in partner_names], dtype='<i4')
+            # Columns not in the framework (retired domains or phases) get 0
+            columns = np.zeros((len(ratings), len(self.columns)), dtype=np.uint8)
+            columns[:, self._layout.ravel()] = ratings.reshape(len(ratings), -1)
+            for i in range(len(self.columns)):
+                with open(self._column_path(i), 'ab') as f:
+                    f.write(columns[:, i].tobytes())
+            with open(self._path(_TIMESTAMPS), 'ab') as f:
+                f.write(timestamps.tobytes())
+            with open(self._path(_ASSESSMENT_IDS), 'ab') as f:
+                f.write(assessment_ids.tobytes())
+            # Written last: a row exists once its partner ID does
+            with open(self._path(_PARTNER_IDS), 'ab') as f:
+                f.write(partner_ids.tobytes())
+
+    def _partner_id(self, name):
+        """Return a partner's ID, registering new partners. Call with the append lock held."""
+        i = self._partner_index.get(name)
+        if i is None:
+            i = len(self.partners)
+            line = (json.dumps(name) + "\n").encode("utf-8")
+            with open(self._path(_PARTNER_NAMES), 'ab') as f:
+                f.write(line)
+            self._partners_read += len(line)
+            self.partners.append(name)
+            self._partner_index[name] = i
+        return i
+
+    def _map(self, path, dtype, rows=None):
+        """Memory-map the first ``rows`` values (default: all rows) of a column file.
+
+        Rows are only ever appended, so a query passes the row count it
+        started with to see the same rows in every column it reads.
+        """
+        if rows is None:
+            rows = len(self)
+        cached = self._maps.get(path)
+        if cached is None or len(cached) < rows:
+            if rows == 0:
+                cached = np.zeros(0, dtype=dtype)
+            else:
+                cached = np.memmap(path, dtype=dtype, mode='r', shape=(rows,))
+            self._maps[path] = cached
+        return cached[:rows]
+
+    @property
+    def timestamps(self):
+        return self._map(self._path(_TIMESTAMPS), '<f8')
+
+    @property
+    def partner_ids(self):
+        return self._map(self._path(_PARTNER_IDS), '<i4')
+
+    @property
+    def assessment_ids(self):
+        return self._map(self._path(_ASSESSMENT_IDS), f'S{_ASSESSMENT_ID_WIDTH}')
+
+    def recorded(self, assessment_id):
+        """Whether an assessment of the app has been recorded as a round."""
+        return bool(assessment_id) and bool((self.assessment_ids == assessment_id.encode("ascii")).any())
+
+    def column(self, domain, phase):
+        """The memory-mapped ratings of one domain and phase, one value per row."""
+        try:
+            i = self._column_index[domain, phase]
+        except KeyError:
+            raise KeyError(f"No ratings stored for {domain} / {phase}") from None
+        return self._map(self._column_path(i), np.uint8)
+
+    def select(self, start=None, end=None, partners=None, latest=False):
+        """Boolean row mask of assessments taken in ``[start, end)``.
+
+        ``partners`` limits the rows to those partners; with ``latest`` only
+        each partner's most recent assessment in the window is kept.
+        """
+        rows = len(self)
+        timestamps = self._map(self._path(_TIMESTAMPS), '<f8', rows)
+        partner_ids = self._map(self._path(_PARTNER_IDS), '<i4', rows)
+        mask = np.ones(rows, dtype=bool)
+        if start is not None:
+            mask &= timestamps >= _epoch(start)
+        if end is not None:
+            mask &= timestamps < _epoch(end)
+        if partners is not None:
+            if any(name not in self._partner_index for name in partners):
+                self._reload_partners()
+            ids = [self._partner_index[name] for name in partners if name in self._partner_index]
+            mask &= np.isin(partner_ids, ids)
+        if latest:
+            selected = np.flatnonzero(mask)
+            order = selected[np.lexsort((timestamps[selected], partner_ids[selected]))]
+            last = np.append(np.diff(partner_ids[order]) != 0, True)
+            mask = np.zeros(rows, dtype=bool)
+            mask[order[last]] = True
+        return mask
+
+    def rounds(self, partner_name, until=None):
+        """Row mask of a partner's assessment rounds.
+
+        An assessment recorded more than once (finished, edited and finished
+        again) is one round, its last row. With ``until``, the ID of a
+        recorded assessment, rounds taken after it are left out.
+        """
+        mask = self.select(partners=[partner_name])
+        rows = np.flatnonzero(mask)
+        ids = self._map(self._path(_ASSESSMENT_IDS), f'S{_ASSESSMENT_ID_WIDTH}', len(mask))[rows]
+        # Rows without an assessment ID are rounds of their own
+        _, last_from_end = np.unique(ids[::-1], return_index=True)
+        keep = ids == b""
+        keep[len(ids) - 1 - last_from_end] = True
+        mask[rows[~keep]] = False
+        if until:
+            matches = rows[keep & (ids == until.encode("ascii"))]
+            if len(matches):
+                timestamps = self._map(self._path(_TIMESTAMPS), '<f8', len(mask))
+                mask &= timestamps <= timestamps[matches[-1]]
+        return mask
+
+    def mean_rating(self, domain, phase, start=None, end=None, latest=False):
+        """Mean rating of a domain and phase over the assessed rows in the window.
+
+        Returns NaN when no assessment in the window rated it.
+        """
+        mask = self.select(start, end, latest=latest)
+        values = self.column(domain, phase)[:len(mask)]
+        mask &= values > 0
+        count = np.count_nonzero(mask)
+        return float(values[mask].sum(dtype=np.int64) / count) if count else float("nan")
+
+    def ratings(self, mask=None):
+        """Ratings of the rows selected by ``mask`` (default: all) as a rows x domains x phases array."""
+        count = len(self) if mask is None else len(mask)
+        rows = np.arange(count) if mask is None else np.flatnonzero(mask)
+        out = np.zeros((len(rows),) + self._layout.shape, dtype=np.uint8)
+        for (d, p), i in np.ndenumerate(self._layout):
+            out[:, d, p] = self._map(self._column_path(i), np.uint8, count)[rows]
+        return out
+
+    def to_portfolio(self, start=None, end=None):
+        """A ``Portfolio`` of each partner's latest assessment in the window."""
+        from maturity.portfolio import Portfolio
+
+        mask = self.select(start, end, latest=True)
+        partner_ids = self._map(self._path(_PARTNER_IDS), '<i4', len(mask))[mask]
+        if len(partner_ids) and partner_ids.max() >= len(self.partners):
+            self._reload_partners()
+        portfolio = Portfolio(self.framework)
+        for partner_id, row in zip(partner_ids, self.ratings(mask)):
+            portfolio.add_ratings(self.partners[partner_id], row)
+        return portfolio
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Append assessments to a cohort store and query it.")
+    parser.add_argument("store", help="cohort store directory")
+    parser.add_argument("--framework", default=FRAMEWORK_PATH, help="framework JSON file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="append assessments from JSON/JSONL")
+    add.add_argument("source", help="directory of .json assessments or a .jsonl file")
+    mean = commands.add_parser("mean", help="mean rating of a domain and phase")
+    mean.add_argument("domain")
+    mean.add_argument("phase")
+    mean.add_argument("--start", help="ISO date, inclusive")
+    mean.add_argument("--end", help="ISO date, exclusive")
+    mean.add_argument("--latest", action="store_true",
+                      help="only count each partner's latest assessment")
+    args = parser.parse_args(argv)
+
+    store = CohortStore(args.store, load_config(args.framework))
+    if args.command == "add":
+        count = store.extend(iter_assessments(args.source))
+        print(f"Appended {count} assessments, {len(store)} stored")
+    else:
+        rows = store.select(args.start, args.end, latest=args.latest)
+        print(f"{store.mean_rating(args.domain, args.phase, args.start, args.end, args.latest):.2f} "
+              f"over {np.count_nonzero(rows)} assessments")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
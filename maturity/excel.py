@@ -0,0 +1,482 @@
+"""Excel report generation for completed assessments.
+
+Only depends on pandas and xlsxwriter so reports can be built outside the
+Streamlit app, e.g. by the batch generator in ``maturity.batch``.
+
+Every sheet is written row by row in order, so a report can also be
+streamed with xlsxwriter's ``constant_memory`` mode, which flushes each row
+to disk as soon as the next one starts. ``create_portfolio_workbook`` uses
+that to export any number of partners with flat memory use.
+
+Everything that is the same for every partner (styles, headers, the
+Definitions sheet, chart skeletons) comes from the framework's
+``ReportTemplate``; the builders here only fill in partner data.
+"""
+
+import io
+import weakref
+
+import pandas as pd
+import xlsxwriter
+
+from maturity.framework import default_framework
+from maturity.aggregate import aggregate_ratings
+from maturity.metrics import timed, timer
+from maturity.model import normalize_results
+from maturity.scoring import get_rating_color
+from maturity.templates import STYLES, report_template
+
+def sanitize_sheet_name(name: str) -> str:
+    """Sanitize partner name to a valid Excel sheet name (max 31 chars)."""
+    invalid_chars = [':', '\\', '/', '?', '*', '[', ']']
+    for c in invalid_chars:
+        name = name.replace(c, '')
+    # Truncate to 25, then we'll add a short prefix
+    name = name[:25]
+    return name
+
+def report_filename(partner_name):
+    """Build the download/output filename for a partner's report."""
+    sanitized = "".join(c for c in partner_name if c.isalnum() or c in (' ', '-', '_')).strip()
+    if not sanitized:
+        sanitized = "AI_Maturity_Assessment"
+    return f"{sanitized}_AI_Maturity_Assessment_Report.xlsx"
+
+class FormatRegistry:
+    """Intern xlsxwriter formats so each distinct style is created once per workbook."""
+
+    def __init__(self, workbook, framework=None):
+        self.workbook = workbook
+        self.framework = framework or default_framework()
+        self.template = report_template(self.framework)
+        self._formats = {}
+        self._styles = {}
+
+    def get(self, properties):
+        """Return the shared format for a dict of format properties."""
+        key = tuple(sorted(properties.items()))
+        fmt = self._formats.get(key)
+        if fmt is None:
+            fmt = self.workbook.add_format(properties)
+            self._formats[key] = fmt
+        return fmt
+
+    def rating(self, rating, properties):
+        """Return the shared format for a rating cell with its maturity color."""
+        return self.get({**properties, 'bg_color': get_rating_color(rating, self.framework)})
+
+    def style(self, name, rating=None):
+        """Return the format of a named template style, colored for ``rating`` if given."""
+        fmt = self._styles.get((name, rating))
+        if fmt is None:
+            if rating is None:
+                fmt = self.get(STYLES[name])
+            else:
+                fmt = self.rating(rating, STYLES[name])
+            self._styles[(name, rating)] = fmt
+        return fmt
+
+_format_registries = weakref.WeakKeyDictionary()
+
+def get_formats(workbook, framework=None):
+    """Get the format registry shared by all sheets of a workbook.
+
+    ``framework`` (for rating colors and the report template) only applies to
+    the first call for a workbook, which creates the registry.
+    """
+    registry = _format_registries.get(workbook)
+    if registry is None:
+        registry = FormatRegistry(workbook, framework)
+        _format_registries[workbook] = registry
+    return registry
+
+def create_excel_workbook(results, framework, partner_name, output=None, streaming=False,
+                          history=None):
+    """Generate Excel report with all sheets.
+
+    The report is written to ``output`` (a path or file-like object) when
+    given, otherwise to a new in-memory buffer which is returned. ``results``
+    may be ``DomainResult`` objects or the equivalent plain dicts. With
+    ``streaming`` the workbook is written in ``constant_memory`` mode. A
+    ``ProgressHistory`` of two or more rounds adds a Progress sheet.
+    """
+    with timer("report_stage", "aggregate"):
+        results = normalize_results(results, framework)
+        aggregates = aggregate_ratings(results, framework)
+    if output is None:
+        output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': streaming})
+    get_formats(workbook, framework)
+
+    # Create Partner Details sheet
+    with timer("report_stage", "partner_details_sheet"):
+        create_partner_details_sheet(workbook, partner_name)
+
+    # Create other sheets without partner name
+    with timer("report_stage", "ratings_sheet"):
+        create_ratings_sheet(workbook, results, framework, "Ratings")
+    with timer("report_stage", "heatmap_sheet"):
+        create_heatmap_sheet(workbook, aggregates, "Heatmap")
+    if history is not None and len(history) >= 2:
+        with timer("report_stage", "progress_sheet"):
+            create_progress_sheet(workbook, history, "Progress")
+    with timer("report_stage", "comments_sheet"):
+        create_comments_sheet(workbook, results, "Comments", framework)
+    with timer("report_stage", "definitions_sheet"):
+        create_definitions_sheet(workbook, "Definitions", framework)
+    with timer("report_stage", "charts_sheet"):
+        create_charts_sheet(workbook, aggregates, "Charts")
+
+    with timer("report_stage", "save"):
+        workbook.close()
+
+    if hasattr(output, 'seek'):
+        output.seek(0)
+    return output
+
+def create_portfolio_workbook(assessments, output, framework=None):
+    """Stream the ratings and comments of many partners into one workbook.
+
+    ``assessments`` is an iterable of ``{"partner_name", "results"}`` records
+    (e.g. ``maturity.batch.iter_assessments``) and is consumed once. Both
+    sheets are filled in a single pass, so only one partner is held in memory
+    at a time. Returns the number of partners written.
+    """
+    framework = framework or default_framework()
+    with xlsxwriter.Workbook(output, {'constant_memory': True}) as workbook:
+        get_formats(workbook, framework)
+        ratings_ws = workbook.add_worksheet("Ratings")
+        comments_ws = workbook.add_worksheet("Comments")
+        ratings_row = write_ratings_header(workbook, ratings_ws, ("Partner",))
+        comments_row = write_comments_header(workbook, comments_ws, ("Partner",))
+        count = 0
+        for count, record in enumerate(assessments, start=1):
+            partner = (record["partner_name"],)
+            results = normalize_results(record["results"], framework)
+            ratings_row = write_ratings_rows(workbook, ratings_ws, results, framework,
+                                             ratings_row, partner)
+            comments_row = write_comments_rows(workbook, comments_ws, results, framework,
+                                               comments_row, partner)
+    return count
+
+def build_chart(workbook, name, series_ranges):
+    """Create a chart from a template skeleton and the data ranges of its series."""
+    options = get_formats(workbook).template.chart_options(name)
+    chart = workbook.add_chart({'type': options['type']})
+    if not chart:
+        return None
+    for series, ranges in zip(options['series'], series_ranges):
+        chart.add_series({**series, **ranges})
+    chart.set_title(options['title'])
+    if 'x_axis' in options:
+        chart.set_x_axis(options['x_axis'])
+    if 'y_axis' in options:
+        chart.set_y_axis(options['y_axis'])
+    chart.set_style(2)
+    chart.set_size(options['size'])
+    if 'legend' in options:
+        chart.set_legend(options['legend'])
+    return chart
+
+def create_partner_details_sheet(workbook, partner_name):
+    """Create a sheet with partner assessment details."""
+    ws = workbook.add_worksheet("Partner Details")
+    
+    # Set column width
+    ws.set_column('A:B', 30)
+    
+    formats = get_formats(workbook)
+    header_format = formats.style('details_label')
+    value_format = formats.style('details_value')
+    
+    # Add assessment details with formatted date and time
+    current = pd.Timestamp.now()
+    date_str = current.strftime("%d-%m-%Y")
+    time_str = current.strftime("%I:%M %p %Z")  # 12-hour format with AM/PM and timezone
+    
+    details = [
+        ["Partner Name", partner_name],
+        ["Assessment Date", date_str],
+        ["Assessment Time", time_str],
+        ["Assessed By", "Meet Shah"]
+    ]
+    
+    for row, (label, value) in enumerate(details):
+        ws.write(row, 0, label, header_format)
+        ws.write(row, 1, value, value_format)
+
+def create_ratings_sheet(workbook, results, framework, sheet_name):
+    """Create the Ratings sheet with color coding."""
+    worksheet = workbook.add_worksheet(sheet_name)
+    row = write_ratings_header(workbook, worksheet)
+    write_ratings_rows(workbook, worksheet, results, framework, row)
+
+def write_ratings_header(workbook, worksheet, leading=()):
+    """Write the Ratings header row after any ``leading`` columns; returns the next row."""
+    formats = get_formats(workbook)
+    header_format = formats.style('ratings_header')
+    for col, val in enumerate((*leading, *formats.template.ratings_headers)):
+        worksheet.write(0, col, val, header_format)
+        worksheet.set_column(col, col, 25)
+    return 1
+
+def write_ratings_rows(workbook, worksheet, results, framework, row, leading=()):
+    """Write one Ratings row per domain and phase, grouped by category.
+
+    Rating and Summary are color coded by rating. Returns the next free row.
+    """
+    formats = get_formats(workbook)
+    summaries = formats.template.level_summaries
+    cell_format = formats.style('ratings_cell')
+    col = len(leading) + 3
+    for cat in framework.categories:
+        for res in results:
+            if res.category != cat:
+                continue
+            for phase, rating in zip(framework.phases, res.ratings):
+                rating_format = formats.style('ratings_rating', rating)
+                worksheet.write_row(row, 0, (*leading, cat, res.domain, phase), cell_format)
+                worksheet.write(row, col, rating, rating_format)
+                worksheet.write(row, col + 1, summaries[rating], rating_format)
+                row += 1
+    return row
+
+def create_heatmap_sheet(workbook, aggregates, sheet_name):
+    """Create heatmap sheet with domain and category level data."""
+    worksheet = workbook.add_worksheet(sheet_name)
+    
+    # Set column widths
+    worksheet.set_column('A:A', 30)  # Domain/Category column
+    worksheet.set_column('B:D', 15)  # Phase columns
+    
+    formats = get_formats(workbook)
+    header_format = formats.style('heatmap_header')
+    name_format = formats.style('heatmap_cell')
+    domain_headers, category_headers = formats.template.heatmap_headers
+    
+    # Write domain-level headers
+    for col, header in enumerate(domain_headers):
+        worksheet.write(0, col, header, header_format)
+    
+    # Write domain-level data
+    row = 1
+    for domain_row in aggregates.domains[list(domain_headers)].itertuples(index=False):
+        worksheet.write(row, 0, domain_row[0], name_format)
+        for col, value in enumerate(domain_row[1:], start=1):
+            worksheet.write(row, col, value, formats.style('heatmap_cell', value))
+        row += 1
+    
+    domain_end_row = row
+    
+    # Add domain-level chart (positioned after domain table)
+    domain_chart_row = domain_end_row + 2
+    add_domain_chart(workbook, worksheet, aggregates.domains, 0, sheet_name, domain_chart_row)
+    
+    # Add spacing between tables (after domain chart)
+    category_start_row = domain_chart_row + 22  # Enough space for the chart
+    
+    # Write category-level headers
+    for col, header in enumerate(category_headers):
+        worksheet.write(category_start_row, col, header, header_format)
+    
+    # Write category-level data
+    row = category_start_row + 1
+    for category_row in aggregates.categories.itertuples(index=False):
+        worksheet.write(row, 0, category_row[0], name_format)
+        for col, value in enumerate(category_row[1:], start=1):
+            value = round(value, 2)
+            worksheet.write(row, col, value, formats.style('heatmap_cell', value))
+        row += 1
+    
+    # Add category-level chart (positioned after category table)
+    if not aggregates.categories.empty:
+        category_chart_row = row + 2
+        add_category_chart(workbook, worksheet, aggregates.categories, category_start_row, sheet_name,
+                           category_chart_row)
+
+def create_progress_sheet(workbook, history, sheet_name, start=-2, end=-1):
+    """Create the sheet comparing two assessment rounds, with averages by round."""
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.set_column('A:A', 30)
+    worksheet.set_column('B:B', 30)
+    worksheet.set_column('C:F', 15)
+
+    formats = get_formats(workbook)
+    header_format = formats.style('ratings_header')
+    domain_headers, category_headers, round_headers = formats.template.progress_headers
+    labels = history.labels
+
+    worksheet.write(0, 0, f"Progress from {labels[start]} to {labels[end]}",
+                    formats.style('details_label'))
+
+    def change_format(change):
+        if change > 0:
+            return formats.style('progress_up')
+        if change < 0:
+            return formats.style('progress_down')
+        return formats.style('progress_change')
+
+    # Domain changes
+    row = 2
+    for col, header in enumerate(domain_headers):
+        worksheet.write(row, col, header, header_format)
+    for category, domain, phase, before, after, change in history.deltas(start, end).itertuples(index=False):
+        row += 1
+        worksheet.write(row, 0, category, formats.style('ratings_cell'))
+        worksheet.write(row, 1, domain, formats.style('ratings_cell'))
+        worksheet.write(row, 2, phase, formats.style('ratings_cell'))
+        worksheet.write(row, 3, before, formats.style('ratings_rating', before))
+        worksheet.write(row, 4, after, formats.style('ratings_rating', after))
+        worksheet.write(row, 5, change, change_format(change))
+
+    # Category movement
+    row += 2
+    for col, header in enumerate(category_headers):
+        worksheet.write(row, col, header, header_format)
+    for category, phase, before, after, change in history.category_deltas(start, end).itertuples(index=False):
+        row += 1
+        before, after, change = round(before, 2), round(after, 2), round(change, 2)
+        worksheet.write(row, 0, category, formats.style('ratings_cell'))
+        worksheet.write(row, 1, phase, formats.style('ratings_cell'))
+        worksheet.write(row, 2, before, formats.style('ratings_rating', before))
+        worksheet.write(row, 3, after, formats.style('ratings_rating', after))
+        worksheet.write(row, 4, change, change_format(change))
+
+    # Average rating per phase for every round, and its line chart
+    row += 2
+    means_row = row
+    for col, header in enumerate(round_headers):
+        worksheet.write(row, col, header, header_format)
+    for label, means in zip(labels, history.phase_means()):
+        row += 1
+        worksheet.write(row, 0, label, formats.style('ratings_cell'))
+        for col, value in enumerate(means, start=1):
+            if value == value:  # NaN: nothing assessed in that phase
+                value = round(float(value), 2)
+                worksheet.write(row, col, value, formats.style('ratings_rating', value))
+
+    chart = build_chart(workbook, 'progress',
+                        table_series(sheet_name, means_row, len(labels), len(round_headers) - 1))
+    if chart:
+        worksheet.insert_chart(means_row, len(round_headers) + 1, chart)
+
+def table_series(sheet_name, startrow, rows, columns):
+    """Series ranges for a table at ``startrow`` with names in its first column.
+
+    There is one series per data column after the names, ``columns`` in all.
+    """
+    return [
+        {
+            'name':       [sheet_name, startrow, i],
+            'categories': [sheet_name, startrow + 1, 0, startrow + rows, 0],
+            'values':     [sheet_name, startrow + 1, i, startrow + rows, i],
+        }
+        for i in range(1, columns + 1)
+    ]
+
+@timed("report_stage")
+def add_domain_chart(workbook, worksheet, df, startrow, sheet_name, chart_row):
+    """Add enhanced chart for domain-level data."""
+    if df.empty:
+        return
+    # The frame has Category and Domain columns; the sheet table only Domain
+    chart = build_chart(workbook, 'domain',
+                        table_series(sheet_name, startrow, len(df), len(df.columns) - 2))
+    if chart:
+        worksheet.insert_chart(chart_row, 0, chart)
+
+@timed("report_stage")
+def add_category_chart(workbook, worksheet, df, startrow, sheet_name, chart_row):
+    """Add enhanced chart for category-level data."""
+    if df.empty:
+        return
+    chart = build_chart(workbook, 'category',
+                        table_series(sheet_name, startrow, len(df), len(df.columns) - 1))
+    if chart:
+        worksheet.insert_chart(chart_row, 0, chart)
+
+def create_comments_sheet(workbook, results, sheet_name, framework=None):
+    """Create the Detailed Comments sheet."""
+    worksheet = workbook.add_worksheet(sheet_name)
+    row = write_comments_header(workbook, worksheet)
+    write_comments_rows(workbook, worksheet, results, framework or default_framework(), row)
+
+def write_comments_header(workbook, worksheet, leading=()):
+    """Write the Detailed Comments header row; returns the next row."""
+    formats = get_formats(workbook)
+    header_format = formats.style('comments_header')
+    for col, col_name in enumerate((*leading, *formats.template.comments_headers)):
+        worksheet.write(0, col, col_name, header_format)
+        worksheet.set_column(col, col, 30)
+    return 1
+
+def write_comments_rows(workbook, worksheet, results, framework, row, leading=()):
+    """Write one Detailed Comments row per domain and phase; returns the next row."""
+    cell_format = get_formats(workbook).style('comments_cell')
+    for res in results:
+        for phase, phase_result in zip(framework.phases, res.phases):
+            worksheet.write_row(row, 0, (
+                *leading,
+                res.domain,
+                phase,
+                phase_result.rating,
+                phase_result.comments,
+                phase_result.partner_details
+            ), cell_format)
+            row += 1
+    return row
+
+def create_definitions_sheet(workbook, sheet_name, framework=None):
+    """
+    Create the Ratings Definition sheet in Excel from the framework's level
+    names and bullet points, with color-coded headers.
+    """
+    ws = workbook.add_worksheet(sheet_name)
+    formats = get_formats(workbook, framework)
+    template = formats.template
+    ws.set_column(0, template.definition_columns - 1, 40)
+
+    # Cells are precomputed row by row (not level by level) so the sheet can be streamed
+    for row_index, cells in enumerate(template.definitions):
+        for col, value, style, rating in cells:
+            ws.write(row_index, col, value, formats.style(style, rating))
+
+def create_charts_sheet(workbook, aggregates, sheet_name):
+    """Create enhanced charts sheet with color coding."""
+    if aggregates.domains.empty:
+        return
+
+    ws = workbook.add_worksheet(sheet_name)
+
+    # Write color-coded table
+    formats = get_formats(workbook)
+    headers = formats.template.heatmap_headers[0]
+    header_format = formats.style('charts_header')
+
+    for col, header in enumerate(headers):
+        ws.write(0, col, header, header_format)
+        ws.set_column(col, col, 15)
+
+    domain_rows = aggregates.domains[list(headers)].itertuples(index=False)
+    for row, domain_row in enumerate(domain_rows, start=1):
+        ws.write(row, 0, domain_row[0])
+        for col, value in enumerate(domain_row[1:], start=1):
+            ws.write(row, col, value, formats.style('charts_rating', value))
+
+    last_row = len(aggregates.domains)
+
+    # Create Radar Chart
+    radar_chart = build_chart(workbook, 'radar', [
+        {'categories': [sheet_name, 1, 0, last_row, 0], 'values': [sheet_name, 1, i, last_row, i]}
+        for i in range(1, len(headers))
+    ])
+    if radar_chart:
+        ws.insert_chart('F2', radar_chart)
+
+    # Create Scatter Chart instead of Bubble Chart
+    scatter_chart = build_chart(workbook, 'scatter', [{
+        'categories': [sheet_name, 1, 1, last_row, 1],  # Plan & Design
+        'values': [sheet_name, 1, 2, last_row, 2],      # Implement
+    }])
+    if scatter_chart:
+        ws.insert_chart('F20', scatter_chart)
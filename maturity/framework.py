@@ -0,0 +1,212 @@
+"""Assessment framework definitions shared by the app and report generation.
+
+Everything that describes a framework (phases, categories, domains and the
+maturity levels with their names, colors and bullet points) lives in a
+versioned JSON framework file. ``load_config`` compiles a file into a
+read-only ``Framework`` of lookup tables once per process, so several
+frameworks can be served side by side and every session shares the same
+compiled tables.
+
+``default_framework()`` returns the default framework file, loaded on first
+use and reloaded after it is edited. The module-level tables of older
+versions (``DOMAINS``, ``PHASES``, ...) are still available, built from it
+on access; code should pass a loaded framework around instead.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+FRAMEWORK_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'ai_maturity_framework_final.json'
+)
+
+class FrameworkError(ValueError):
+    """Raised when a framework file is incomplete or inconsistent."""
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Framework:
+    """A loaded, validated and read-only framework file.
+
+    Indexing works like the parsed JSON (``framework["maturity_levels"]``).
+    Frameworks compare and hash by identity, so they can key caches.
+    """
+    path: str
+    mtime: float
+    version: str
+    data: MappingProxyType
+    phases: tuple
+    categories: MappingProxyType         # category -> tuple of domains
+    domains: tuple                       # all domains in assessment order
+    domain_categories: MappingProxyType  # domain -> category
+    domain_index: MappingProxyType       # domain -> position in ``domains``
+    phase_index: MappingProxyType        # phase -> position in ``phases``
+    levels: tuple                        # level keys ("1", "2", ...) in order
+    level_names: MappingProxyType        # level -> display name
+    level_colors: MappingProxyType       # level -> hex color
+    level_details: MappingProxyType      # level -> tuple of bullet points
+    rating_colors: MappingProxyType      # int rating -> hex color
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def category_for_domain(self, domain):
+        """Return the category of a domain, or "Unknown"."""
+        return self.domain_categories.get(domain, "Unknown")
+
+    def rating_color(self, rating):
+        """Return the color for a (possibly fractional) rating, white if out of range."""
+        return self.rating_colors.get(int(round(rating)), '#FFFFFF')
+
+_frameworks = {}
+_frameworks_lock = threading.Lock()
+
+def load_config(path=FRAMEWORK_PATH):
+    """Load the framework file, reusing the compiled copy until the file changes.
+
+    Each call only costs a ``stat``; the file is re-read and re-validated
+    when its modification time changes.
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime
+    framework = _frameworks.get(path)
+    if framework is not None and framework.mtime == mtime:
+        return framework
+
+    with _frameworks_lock:
+        framework = _frameworks.get(path)
+        if framework is None or framework.mtime != mtime:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except ValueError as e:
+                raise FrameworkError(f"Invalid framework file {path}: {e}") from None
+            problems = validate_framework(data)
+            if problems:
+                raise FrameworkError(f"Invalid framework file {path}:\n- " + "\n- ".join(problems))
+            framework = compile_framework(data, path, mtime)
+            _frameworks[path] = framework
+    return framework
+
+def compile_framework(data, path="", mtime=0.0):
+    """Build the lookup tables of a ``Framework`` from validated framework JSON."""
+    categories = {category: tuple(domains) for category, domains in data["categories"].items()}
+    domains = tuple(domain for category_domains in categories.values() for domain in category_domains)
+    levels = tuple(sorted(data["maturity_levels"], key=int))
+    level_info = data["maturity_levels"]
+    return Framework(
+        path=path,
+        mtime=mtime,
+        version=str(data["version"]),
+        data=_freeze(data),
+        phases=tuple(data["phases"]),
+        categories=MappingProxyType(categories),
+        domains=domains,
+        domain_categories=MappingProxyType(
+            {domain: category for category, ds in categories.items() for domain in ds}),
+        domain_index=MappingProxyType({domain: i for i, domain in enumerate(domains)}),
+        phase_index=MappingProxyType({phase: i for i, phase in enumerate(data["phases"])}),
+        levels=levels,
+        level_names=MappingProxyType({level: level_info[level]["name"] for level in levels}),
+        level_colors=MappingProxyType({level: level_info[level]["color"] for level in levels}),
+        level_details=MappingProxyType(
+            {level: tuple(level_info[level]["details"]) for level in levels}),
+        rating_colors=MappingProxyType({int(level): level_info[level]["color"] for level in levels})
+    )
+
+def validate_framework(data):
+    """Return a list of problems found in framework JSON, empty if it is usable."""
+    if not isinstance(data, dict):
+        return ["the framework must be a JSON object"]
+    problems = []
+    for key in ("version", "phases", "categories", "maturity_levels", "domains"):
+        if key not in data:
+            problems.append(f"'{key}' is missing")
+    for key, kind, name in (("phases", list, "a list"), ("categories", dict, "an object"),
+                            ("maturity_levels", dict, "an object"), ("domains", dict, "an object")):
+        if key in data and not isinstance(data[key], kind):
+            problems.append(f"'{key}' must be {name}")
+    if problems:
+        return problems
+
+    phases = data["phases"]
+    if not phases or not all(isinstance(phase, str) and phase for phase in phases):
+        problems.append("'phases' must be a non-empty list of names")
+    elif len(set(phases)) != len(phases):
+        problems.append("'phases' lists a phase more than once")
+    if problems:
+        return problems
+
+    levels = data["maturity_levels"]
+    if set(levels) != {str(i) for i in range(1, len(levels) + 1)}:
+        problems.append("maturity levels must be numbered 1, 2, ... without gaps")
+    for level, info in levels.items():
+        if not isinstance(info, dict):
+            problems.append(f"maturity level {level} must be an object")
+            continue
+        for key in ("name", "color", "details"):
+            if key not in info:
+                problems.append(f"maturity level {level} has no {key}")
+        for key in ("name", "color"):
+            if key in info and not isinstance(info[key], str):
+                problems.append(f"maturity level {level} {key} must be a string")
+        details = info.get("details", [])
+        if not isinstance(details, list) or not all(isinstance(d, str) for d in details):
+            problems.append(f"maturity level {level} details must be a list of strings")
+
+    seen = {}
+    for category, domains in data["categories"].items():
+        if not isinstance(domains, list) or not all(isinstance(d, str) for d in domains):
+            problems.append(f"category '{category}' must list its domains by name")
+            continue
+        if not domains:
+            problems.append(f"category '{category}' has no domains")
+        for domain in domains:
+            if domain in seen:
+                problems.append(f"domain '{domain}' is in both '{seen[domain]}' and '{category}'")
+            seen[domain] = category
+
+    domains = data["domains"]
+    for domain in seen:
+        if domain not in domains:
+            problems.append(f"domain '{domain}' ({seen[domain]}) is missing from 'domains'")
+    for domain, domain_phases in domains.items():
+        if domain not in seen:
+            problems.append(f"domain '{domain}' is not in any category")
+        elif not isinstance(domain_phases, dict) or set(domain_phases) != set(phases):
+            problems.append(f"domain '{domain}' does not list the phases {', '.join(phases)}")
+
+    return problems
+
+def _freeze(value):
+    """Recursively convert parsed JSON into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def default_framework():
+    """Return the default framework, loading it on first use and after edits."""
+    return load_config()
+
+# Tables of the default framework older code imports by name
+_LEGACY_TABLES = {
+    "DEFAULT_FRAMEWORK": lambda f: f,
+    "PHASES": lambda f: list(f.phases),
+    "MATURITY_LEVELS_DETAILS": lambda f: {level: list(d) for level, d in f.level_details.items()},
+    "MATURITY_LEVEL_NAMES": lambda f: dict(f.level_names),
+    "CATEGORIES": lambda f: {category: list(d) for category, d in f.categories.items()},
+    "DOMAINS": lambda f: list(f.domains),
+    "DOMAIN_CATEGORIES": lambda f: dict(f.domain_categories),
+    "MATURITY_COLORS": lambda f: dict(f.rating_colors),
+}
+
+def __getattr__(name):
+    """Build the legacy tables from the current default framework when accessed."""
+    if name in _LEGACY_TABLES:
+        return _LEGACY_TABLES[name](default_framework())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,225 @@
+"""Import assessments from Excel reports and CSV files.
+
+Reads the "Comments" sheet (or, failing that, the "Ratings" sheet) of reports
+written by ``maturity.excel``, including portfolio workbooks with a leading
+Partner column, and CSV files with the same columns. Rows are streamed and
+only the needed columns are kept. Every file is validated against the
+framework before anything is returned::
+
+    python -m maturity.importer offline/*.xlsx -o assessments.jsonl --workers 8
+
+The JSONL output is the input format of ``maturity.batch``, so reports can be
+round-tripped and regenerated without re-entering data.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from maturity.framework import FRAMEWORK_PATH, default_framework, load_config
+from maturity.model import make_domain_result
+from maturity.templates import level_texts
+
+REPORT_SUFFIX = "_AI_Maturity_Assessment_Report"
+
+# Columns read from the input; any others (Category, Summary, ...) are ignored
+COLUMNS = ("Partner", "Domain", "Phase", "Rating", "Selected Points", "Partner Specific Details")
+REQUIRED_COLUMNS = ("Domain", "Phase", "Rating")
+
+_framework = None
+
+class AssessmentImportError(ValueError):
+    """Raised when a file does not hold valid assessments for the framework."""
+
+def read_assessments(source, framework=None, filename=None):
+    """Read the assessments in one ``.xlsx`` report or ``.csv`` file.
+
+    ``source`` is a path or a binary file object; ``filename`` (defaulting to
+    the path) decides the format and the partner name when the file does not
+    name one. Returns a list of ``{"partner_name", "results"}`` records with
+    ``DomainResult`` results in framework order.
+    """
+    framework = framework or default_framework()
+    filename = filename or source
+    if filename.lower().endswith(".csv"):
+        if isinstance(source, str):
+            with open(source, 'r', newline='', encoding='utf-8-sig') as f:
+                rows, partner_name = list(_parse_rows(csv.reader(f))), None
+        else:
+            text = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+            rows, partner_name = list(_parse_rows(csv.reader(text))), None
+    else:
+        rows, partner_name = _read_workbook(source)
+
+    default_name = partner_name or _partner_from_filename(filename)
+    partners = {}
+    for row in rows:
+        name = row.pop("Partner", None) or default_name
+        partners.setdefault(name, []).append(row)
+    if not partners:
+        raise AssessmentImportError(f"{filename}: no assessment rows found")
+
+    problems = []
+    records = [
+        {"partner_name": name, "results": _build_results(name, partner_rows, framework, problems)}
+        for name, partner_rows in partners.items()
+    ]
+    if problems:
+        raise AssessmentImportError(f"Invalid assessment file {filename}:\n- " + "\n- ".join(problems))
+    return records
+
+def _read_workbook(source):
+    """Return the parsed rows and the Partner Details name of a report workbook."""
+    # openpyxl is only needed for imports, so it is imported on first use
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        partner_name = None
+        if "Partner Details" in workbook.sheetnames:
+            for label, value, *_ in workbook["Partner Details"].iter_rows(values_only=True):
+                if label == "Partner Name" and value:
+                    partner_name = str(value)
+                    break
+        for sheet_name in ("Comments", "Ratings"):
+            if sheet_name in workbook.sheetnames:
+                rows = list(_parse_rows(workbook[sheet_name].iter_rows(values_only=True)))
+                return rows, partner_name
+        raise AssessmentImportError("workbook has neither a 'Comments' nor a 'Ratings' sheet")
+    finally:
+        workbook.close()
+
+def _parse_rows(rows):
+    """Yield a dict of the known columns for each non-empty row after the header."""
+    rows = iter(rows)
+    header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise AssessmentImportError(f"missing column(s): {', '.join(missing)}")
+    wanted = [(header.index(column), column) for column in COLUMNS if column in header]
+    for row in rows:
+        values = {column: row[i] if i < len(row) else None for i, column in wanted}
+        if any(v not in (None, "") for v in values.values()):
+            yield values
+
+def _build_results(partner_name, rows, framework, problems):
+    """Validate one partner's rows and build their results, appending to ``problems``."""
+    domains = {}
+    for row in rows:
+        domain, phase = str(row["Domain"] or "").strip(), str(row["Phase"] or "").strip()
+        where = f"{partner_name}: {domain or '?'} / {phase or '?'}"
+        if domain not in framework.domain_index:
+            problems.append(f"{where}: unknown domain")
+            continue
+        if phase not in framework.phase_index:
+            problems.append(f"{where}: unknown phase")
+            continue
+        try:
+            value = float(row["Rating"])
+        except (TypeError, ValueError):
+            value = None
+        # 3.0 from a spreadsheet cell is a rating; 3.7 is not
+        rating = int(value) if value is not None and value.is_integer() else None
+        if str(rating) not in framework.level_names:
+            problems.append(f"{where}: rating {row['Rating']!r} is not one of "
+                            f"{', '.join(framework.levels)}")
+            continue
+        if phase in domains.setdefault(domain, {}):
+            problems.append(f"{where}: listed more than once")
+            continue
+
+        comments = row.get("Selected Points")
+        if comments is None:
+            # Ratings-only input: use the level's points, as the app would
+            comments = level_texts(framework).comments[str(rating)]
+        domains[domain][phase] = {
+            "rating": rating,
+            "comments": str(comments),
+            "partner_details": str(row.get("Partner Specific Details") or ""),
+            "color": framework.level_colors[str(rating)]
+        }
+
+    results = []
+    for domain in framework.domains:
+        if domain not in domains:
+            continue
+        missing = [phase for phase in framework.phases if phase not in domains[domain]]
+        if missing:
+            problems.append(f"{partner_name}: {domain} has no rating for {', '.join(missing)}")
+            continue
+        results.append(make_domain_result(domain, domains[domain], framework))
+    return results
+
+def _partner_from_filename(filename):
+    """Guess a partner name from a report file name."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return stem[:-len(REPORT_SUFFIX)] if stem.endswith(REPORT_SUFFIX) else stem
+
+def _init_worker(framework_path):
+    """Load the framework once per worker process."""
+    global _framework
+    _framework = load_config(framework_path)
+
+def _read_file(path):
+    """Worker: read one file into JSON-ready records."""
+    return [
+        {"partner_name": record["partner_name"],
+         "results": [res.to_dict(_framework) for res in record["results"]]}
+        for record in read_assessments(path, _framework)
+    ]
+
+def iter_input_files(inputs):
+    """Expand directories in ``inputs`` into the ``.xlsx`` and ``.csv`` files they hold."""
+    for path in inputs:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(('.xlsx', '.csv')) and not name.startswith('~$'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+def import_files(paths, framework_path=FRAMEWORK_PATH, workers=None):
+    """Parse files in parallel.
+
+    Returns ``(records, failures)``: the JSON-ready records of all valid
+    files in input order, and ``(path, error)`` pairs for the others.
+    """
+    load_config(framework_path)
+    paths = list(paths)
+    parsed, failures = {}, []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(framework_path,)) as pool:
+        futures = {pool.submit(_read_file, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                parsed[futures[future]] = future.result()
+            except Exception as e:
+                failures.append((futures[future], str(e)))
+    records = [record for path in paths if path in parsed for record in parsed[path]]
+    return records, failures
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Import assessments from reports and CSV files.")
+    parser.add_argument("inputs", nargs="+", help=".xlsx/.csv files or directories of them")
+    parser.add_argument("-o", "--output", default="assessments.jsonl", help="JSONL file to write")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--framework", default=FRAMEWORK_PATH, help="framework JSON file")
+    args = parser.parse_args(argv)
+
+    records, failures = import_files(iter_input_files(args.inputs), args.framework, args.workers)
+    for path, error in failures:
+        print(f"Failed to import {path}: {error}", file=sys.stderr)
+    with open(args.output, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    print(f"Imported {len(records)} assessments to {args.output}, {len(failures)} files failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Background report builds.
+
+``ReportQueue`` builds Excel reports on a small thread pool so a slow export
+never blocks the Streamlit script thread. Jobs are keyed by a content hash
+of what they build, so identical requests made while a build is queued or
+running share that one build, and a finished report is served from disk
+until it expires::
+
+    queue = ReportQueue("report_jobs")
+    job = queue.submit(fingerprint, results, framework, partner_name)
+    ...
+    job = queue.get(fingerprint)
+    if job.status == DONE:
+        data = queue.read(job)
+
+Each job's status is also written next to its report as ``<job_id>.json``,
+so a restarted server still finds reports that finished before it stopped.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from maturity.excel import create_excel_workbook
+
+DEFAULT_REPORT_DIR = os.environ.get("AI_MATURITY_REPORT_DIR", "report_jobs")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+class JobQueueFull(RuntimeError):
+    """Raised when too many report builds are already waiting."""
+
+@dataclass
+class ReportJob:
+    """State of one report build."""
+    job_id: str
+    partner_name: str
+    status: str = QUEUED
+    error: str = ""
+    submitted: float = 0.0
+    finished: float = 0.0
+
+class ReportQueue:
+    """Bounded pool of report builds with on-disk results."""
+
+    def __init__(self, directory=DEFAULT_REPORT_DIR, workers=2, max_pending=16, max_age=24 * 3600):
+        self.directory = directory
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report")
+        os.makedirs(directory, exist_ok=True)
+
+    def report_path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.xlsx")
+
+    def _status_path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def submit(self, job_id, results, framework, partner_name, history=None):
+        """Queue a build unless one for ``job_id`` is pending or done; return its job.
+
+        Failed jobs are retried. Raises ``JobQueueFull`` if ``max_pending``
+        builds are already queued or running.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id) or self._load(job_id)
+            if job is not None and job.status != FAILED:
+                return job
+            pending = sum(j.status in (QUEUED, RUNNING) for j in self._jobs.values())
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} reports are already being generated")
+            job = ReportJob(job_id, partner_name, submitted=time.time())
+            self._jobs[job_id] = job
+            self._save(job)
+        self._pool.submit(self._build, job, tuple(results), framework, history)
+        self.purge_expired()
+        return job
+
+    def get(self, job_id):
+        """Return the job for ``job_id`` from memory or disk, or None."""
+        with self._lock:
+            job = self._jobs.get(job_id) or self._load(job_id)
+            if job is not None:
+                self._jobs[job_id] = job
+            return job
+
+    def read(self, job):
+        """Return the bytes of a finished job's report."""
+        with open(self.report_path(job.job_id), 'rb') as f:
+            return f.read()
+
+    def purge_expired(self):
+        """Delete finished reports older than ``max_age`` seconds."""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job.status in (DONE, FAILED) and job.finished < cutoff:
+                    del self._jobs[job_id]
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                job = self._jobs.get(os.path.splitext(name)[0])
+                if job is None and os.path.getmtime(path) < cutoff:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def _build(self, job, results, framework, history=None):
+        """Worker: build the report into a temporary file, then publish it."""
+        self._set_status(job, RUNNING)
+        path = self.report_path(job.job_id)
+        tmp_path = f"{os.path.splitext(path)[0]}.partial-{threading.get_ident()}.xlsx"
+        try:
+            create_excel_workbook(results, framework, job.partner_name, tmp_path, history=history)
+            os.replace(tmp_path, path)
+            self._set_status(job, DONE)
+        except Exception as e:
+            self._set_status(job, FAILED, str(e))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _set_status(self, job, status, error=""):
+        with self._lock:
+            job.status = status
+            job.error = error
+            if status in (DONE, FAILED):
+                job.finished = time.time()
+            self._save(job)
+
+    def _save(self, job):
+        """Atomically write a job's status file. Call with the lock held."""
+        path = self._status_path(job.job_id)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(asdict(job), f)
+        os.replace(path + ".tmp", path)
+
+    def _load(self, job_id):
+        """Read a finished job left on disk by an earlier process. Call with the lock held."""
+        try:
+            with open(self._status_path(job_id), 'r') as f:
+                job = ReportJob(**json.load(f))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        # Builds that were queued or running when that process stopped never finish
+        if job.status != DONE or not os.path.exists(self.report_path(job_id)):
+            return None
+        return job
@@ -0,0 +1,160 @@
+"""In-process timing metrics for app reruns and report generation.
+
+Code under measurement wraps each stage in ``timer`` (or decorates it with
+``timed``). Every observation updates a per-stage count, total and maximum in
+the process-wide ``REGISTRY`` and is logged at DEBUG level on the
+``maturity.metrics`` logger. A ``profile`` groups the stages of one unit of
+work, such as a Streamlit rerun, and the most recent profiles are kept for
+inspection::
+
+    with REGISTRY.profile("rerun"):
+        with timer("rerun_phase", "config_load"):
+            framework = load_config()
+
+``REGISTRY.prometheus_text()`` renders everything in the Prometheus text
+format, and ``serve_metrics`` exposes it over HTTP.
+"""
+
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "ai_maturity"
+
+@dataclass(slots=True)
+class StageStats:
+    """Running totals for one metric and stage."""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+@dataclass(slots=True)
+class Profile:
+    """The stages timed during one unit of work, in the order they finished."""
+    name: str
+    started: float
+    seconds: float = 0.0
+    stages: list = field(default_factory=list)  # (metric, stage, seconds) tuples
+
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+
+class MetricsRegistry:
+    """Thread-safe per-stage timing statistics and the last few profiles."""
+
+    def __init__(self, max_profiles=20):
+        self._stats = {}
+        self._profiles = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def observe(self, metric, stage, seconds):
+        """Record one timing of ``stage`` under ``metric``."""
+        with self._lock:
+            stats = self._stats.get((metric, stage))
+            if stats is None:
+                stats = self._stats[(metric, stage)] = StageStats()
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.stages.append((metric, stage, seconds))
+        logger.debug("%s %s %.2f ms", metric, stage, seconds * 1000)
+
+    @contextmanager
+    def timer(self, metric, stage):
+        """Time the enclosed block, also when it exits with an exception."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, stage, time.perf_counter() - start)
+
+    @contextmanager
+    def profile(self, name):
+        """Collect the stages timed in the enclosed block into a new profile."""
+        profile = Profile(name, time.time())
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            yield profile
+        finally:
+            profile.seconds = time.perf_counter() - start
+            _current_profile.reset(token)
+            with self._lock:
+                self._profiles.append(profile)
+
+    def recent_profiles(self):
+        """Return the most recent profiles, newest first."""
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def snapshot(self):
+        """Return a copy of the statistics keyed by ``(metric, stage)``."""
+        with self._lock:
+            return {key: StageStats(s.count, s.total, s.max) for key, s in self._stats.items()}
+
+    def prometheus_text(self):
+        """Render the statistics in the Prometheus text exposition format."""
+        by_metric = {}
+        for (metric, stage), stats in sorted(self.snapshot().items()):
+            by_metric.setdefault(metric, []).append((stage, stats))
+
+        lines = []
+        for metric, stages in by_metric.items():
+            name = f"{METRIC_PREFIX}_{metric}_seconds"
+            lines.append(f"# HELP {name} Time spent per {metric.replace('_', ' ')}.")
+            lines.append(f"# TYPE {name} summary")
+            for stage, stats in stages:
+                lines.append(f'{name}_count{{stage="{stage}"}} {stats.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {stats.total:.6f}')
+            lines.append(f"# HELP {name}_max Longest single {metric.replace('_', ' ')}.")
+            lines.append(f"# TYPE {name}_max gauge")
+            for stage, stats in stages:
+                lines.append(f'{name}_max{{stage="{stage}"}} {stats.max:.6f}')
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+def timer(metric, stage):
+    """Time the enclosed block in the process-wide registry."""
+    return REGISTRY.timer(metric, stage)
+
+def timed(metric, stage=None):
+    """Decorator timing every call of a function; ``stage`` defaults to its name."""
+    def decorator(func):
+        name = stage or func.__name__
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with REGISTRY.timer(metric, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def serve_metrics(port, registry=REGISTRY, host="0.0.0.0"):
+    """Serve ``/metrics`` in the Prometheus text format from a daemon thread."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,109 @@
+"""Typed representation of assessment results.
+
+The app and the report builders work on a list of ``DomainResult`` objects,
+one per assessed domain. ``normalize_results`` converts the older dict and
+``pd.Series`` row shapes (e.g. from batch input files) into that form.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from maturity.framework import default_framework
+
+@dataclass(frozen=True, slots=True)
+class PhaseResult:
+    """Rating and notes for one phase of a domain."""
+    rating: int
+    comments: str = ""
+    partner_details: str = ""
+    color: str = ""
+
+@dataclass(frozen=True, slots=True)
+class DomainResult:
+    """Ratings for every phase of one domain, ordered like the framework's phases."""
+    domain: str
+    category: str
+    phases: tuple
+
+    def phase(self, phase, framework=None):
+        """Return the ``PhaseResult`` for a phase name."""
+        return self.phases[(framework or default_framework()).phase_index[phase]]
+
+    @property
+    def ratings(self):
+        """Ratings for all phases, in framework phase order."""
+        return tuple(p.rating for p in self.phases)
+
+    def to_dict(self, framework=None):
+        """Convert to the plain dict shape used in JSON assessment files."""
+        return {
+            "Domain": self.domain,
+            **{
+                phase: {
+                    "rating": p.rating,
+                    "comments": p.comments,
+                    "partner_details": p.partner_details,
+                    "color": p.color
+                }
+                for phase, p in zip((framework or default_framework()).phases, self.phases)
+            }
+        }
+
+def make_domain_result(domain, phase_results, framework=None):
+    """Build a ``DomainResult`` from a mapping of phase name to phase data."""
+    framework = framework or default_framework()
+    category = framework.category_for_domain(domain)
+    if category == "Unknown":
+        raise ValueError(f"Unknown domain: {domain}")
+    return DomainResult(
+        domain=domain,
+        category=category,
+        phases=tuple(
+            PhaseResult(
+                rating=int(phase_results[phase]["rating"]),
+                comments=phase_results[phase].get("comments", "") or "",
+                partner_details=phase_results[phase].get("partner_details", "") or "",
+                color=phase_results[phase].get("color", "") or ""
+            )
+            for phase in framework.phases
+        )
+    )
+
+def normalize_result(res, framework=None):
+    """Convert a dict or ``pd.Series`` result row into a ``DomainResult``."""
+    if isinstance(res, DomainResult):
+        return res
+    framework = framework or default_framework()
+    if isinstance(res, pd.Series):
+        phase_results = {
+            phase: {
+                "rating": res.get((phase, "rating"), 0),
+                "comments": res.get((phase, "comments"), ""),
+                "partner_details": res.get((phase, "partner_details"), ""),
+                "color": res.get((phase, "color"), "")
+            }
+            for phase in framework.phases
+        }
+        return make_domain_result(res.get("Domain"), phase_results, framework)
+    return make_domain_result(res["Domain"], res, framework)
+
+def normalize_results(results, framework=None):
+    """Convert a list of result rows into ``DomainResult`` objects."""
+    return [normalize_result(res, framework) for res in results]
+
+def ratings_frame(results, framework=None):
+    """Build a Category/Domain/phase-ratings DataFrame from results."""
+    return pd.DataFrame(
+        [(res.category, res.domain, *res.ratings) for res in results],
+        columns=["Category", "Domain", *(framework or default_framework()).phases]
+    )
+
+def ratings_array(results, framework=None, dtype=np.uint8):
+    """Ratings of results as a domains x phases array in framework order, 0 where not assessed."""
+    framework = framework or default_framework()
+    array = np.zeros((len(framework.domains), len(framework.phases)), dtype=dtype)
+    for res in normalize_results(results, framework):
+        array[framework.domain_index[res.domain]] = res.ratings
+    return array
@@ -0,0 +1,251 @@
+"""Cross-partner portfolio aggregation and benchmarking.
+
+A ``Portfolio`` holds the ratings of many partners in one
+partners x domains x phases array. Per domain and phase rating histograms
+are kept up to date as assessments are added, so cohort distributions and a
+partner's standing against the cohort are answered from a few small arrays
+instead of re-reading every stored assessment::
+
+    portfolio = Portfolio.from_source("assessments.jsonl")
+    portfolio.rank("Acme")
+"""
+
+import warnings
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from maturity.batch import iter_assessments
+from maturity.framework import default_framework
+from maturity.model import normalize_results
+from maturity.snapshot import Snapshot
+
+class PortfolioTables(NamedTuple):
+    """Array lookups for one framework, shared by every portfolio using it."""
+    levels: int
+    category_matrix: np.ndarray  # one-hot category membership, categories x domains
+    domain_idx: np.ndarray       # domains x phases grid of domain positions
+    phase_idx: np.ndarray        # domains x phases grid of phase positions
+    domain_columns: dict         # Category/Domain/Phase columns for per-domain tables
+    category_columns: dict       # Category/Phase columns for per-category tables
+
+@lru_cache(maxsize=None)
+def portfolio_tables(framework):
+    """Compile the ``PortfolioTables`` of a framework once per process."""
+    domains, phases, categories = framework.domains, framework.phases, list(framework.categories)
+    domain_idx, phase_idx = np.indices((len(domains), len(phases)))
+    return PortfolioTables(
+        levels=len(framework.levels),
+        category_matrix=np.array(
+            [[framework.domain_categories[domain] == category for domain in domains]
+             for category in categories],
+            dtype=np.float64
+        ),
+        domain_idx=domain_idx,
+        phase_idx=phase_idx,
+        domain_columns={
+            "Category": np.repeat([framework.domain_categories[d] for d in domains], len(phases)),
+            "Domain": np.repeat(domains, len(phases)),
+            "Phase": np.tile(phases, len(domains)),
+        },
+        category_columns={
+            "Category": np.repeat(categories, len(phases)),
+            "Phase": np.tile(phases, len(categories)),
+        }
+    )
+
+class Portfolio:
+    """Ratings of a cohort of partners with incrementally maintained statistics.
+
+    A rating of 0 marks a domain the partner was not assessed on; it is
+    left out of every statistic.
+    """
+
+    def __init__(self, framework=None, capacity=256):
+        self.framework = framework or default_framework()
+        self._tables = portfolio_tables(self.framework)
+        shape = (len(self.framework.domains), len(self.framework.phases))
+        self.partners = []
+        self._index = {}
+        self._ratings = np.zeros((capacity,) + shape, dtype=np.int8)
+        self._category_means = np.full(
+            (capacity, len(self.framework.categories), shape[1]), np.nan)
+        # Count of partners per domain, phase and rating (0 = not assessed)
+        self._histogram = np.zeros(shape + (self._tables.levels + 1,), dtype=np.int64)
+
+    @classmethod
+    def from_source(cls, source, framework=None):
+        """Build a portfolio from a directory of JSON files or a JSONL file."""
+        portfolio = cls(framework)
+        for record in iter_assessments(source):
+            portfolio.add(record["partner_name"], record["results"])
+        return portfolio
+
+    @classmethod
+    def from_snapshots(cls, paths, framework=None):
+        """Build a portfolio from assessment snapshot files (see ``maturity.snapshot``)."""
+        portfolio = cls(framework)
+        for path in paths:
+            with open(path, 'rb') as f:
+                portfolio.add_snapshot(Snapshot.decode(f.read()))
+        return portfolio
+
+    def __len__(self):
+        return len(self.partners)
+
+    def __contains__(self, partner_name):
+        return partner_name in self._index
+
+    def add(self, partner_name, results):
+        """Add a partner's results, replacing any earlier assessment."""
+        row = np.zeros(self._ratings.shape[1:], dtype=np.int8)
+        for res in normalize_results(results, self.framework):
+            ratings = res.ratings
+            if any(not 1 <= rating <= self._tables.levels for rating in ratings):
+                raise ValueError(f"Invalid rating for {res.domain}: {ratings}")
+            row[self.framework.domain_index[res.domain]] = ratings
+        self._set_row(partner_name, row)
+
+    def add_snapshot(self, snapshot):
+        """Add the completed domains of a ``Snapshot``, replacing any earlier assessment.
+
+        The packed ratings are used directly, without building results.
+        """
+        row = snapshot.aligned_ratings(self.framework)
+        completed = np.array([domain in snapshot.completed for domain in self.framework.domains])
+        # Like ``add``, only domains completed in every phase count
+        row[~(completed & (row > 0).all(axis=1))] = 0
+        self.add_ratings(snapshot.partner_name, row)
+
+    def add_ratings(self, partner_name, ratings):
+        """Add a partner's domains x phases ratings array (0 = not assessed)."""
+        row = np.asarray(ratings).astype(np.int8)
+        if row.shape != self._ratings.shape[1:] or ((row < 0) | (row > self._tables.levels)).any():
+            raise ValueError(f"Invalid ratings for {partner_name}")
+        self._set_row(partner_name, row)
+
+    def _set_row(self, partner_name, row):
+        """Store a partner's domains x phases ratings and update the statistics."""
+        tables = self._tables
+        i = self._index.get(partner_name)
+        if i is None:
+            i = len(self.partners)
+            if i == len(self._ratings):
+                self._grow()
+            self.partners.append(partner_name)
+            self._index[partner_name] = i
+        else:
+            self._histogram[tables.domain_idx, tables.phase_idx, self._ratings[i]] -= 1
+
+        self._ratings[i] = row
+        self._histogram[tables.domain_idx, tables.phase_idx, row] += 1
+        self._category_means[i] = _category_means(row, tables.category_matrix)
+
+    def _grow(self):
+        """Double the capacity of the per-partner arrays."""
+        capacity = 2 * len(self._ratings)
+        ratings = np.zeros((capacity,) + self._ratings.shape[1:], dtype=self._ratings.dtype)
+        ratings[:len(self._ratings)] = self._ratings
+        category_means = np.full((capacity,) + self._category_means.shape[1:], np.nan)
+        category_means[:len(self._category_means)] = self._category_means
+        self._ratings = ratings
+        self._category_means = category_means
+
+    @property
+    def ratings(self):
+        """Ratings array of shape partners x domains x phases."""
+        return self._ratings[:len(self)]
+
+    def domain_stats(self):
+        """Rating distribution, mean and quartiles per domain and phase."""
+        counts = self._histogram[..., 1:]
+        n = counts.sum(axis=-1)
+        levels = np.arange(1, self._tables.levels + 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = (counts * levels).sum(axis=-1) / n
+
+        stats = {
+            **self._tables.domain_columns,
+            "Partners": n.ravel(),
+            "Mean": mean.ravel(),
+            "P25": _histogram_quantile(counts, 0.25).ravel(),
+            "Median": _histogram_quantile(counts, 0.5).ravel(),
+            "P75": _histogram_quantile(counts, 0.75).ravel(),
+        }
+        for level in levels:
+            stats[f"Level {level}"] = counts[..., level - 1].ravel()
+        return pd.DataFrame(stats)
+
+    def category_stats(self):
+        """Mean and quartiles of partners' category averages per phase."""
+        means = self._category_means[:len(self)]
+        with warnings.catch_warnings():
+            # Categories nobody has been assessed on yet are reported as NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(means, axis=0)
+            p25, median, p75 = np.nanpercentile(means, [25, 50, 75], axis=0)
+        return pd.DataFrame({
+            **self._tables.category_columns,
+            "Partners": (~np.isnan(means)).sum(axis=0).ravel(),
+            "Mean": mean.ravel(),
+            "P25": p25.ravel(),
+            "Median": median.ravel(),
+            "P75": p75.ravel(),
+        })
+
+    def rank(self, partner_name):
+        """Where a partner sits versus the cohort for each domain and phase.
+
+        ``Percentile`` is the mid-rank percentile: the share of assessed
+        partners rated lower, plus half of those with the same rating.
+        """
+        row = self._ratings[self._index[partner_name]]
+        counts = self._histogram[..., 1:]
+        n = counts.sum(axis=-1)
+        below = np.concatenate(
+            [np.zeros(counts.shape[:-1] + (1,), dtype=counts.dtype), counts.cumsum(axis=-1)],
+            axis=-1
+        )
+        index = np.maximum(row.astype(np.intp) - 1, 0)[..., None]
+        lower = np.take_along_axis(below, index, axis=-1)[..., 0]
+        equal = np.take_along_axis(counts, index, axis=-1)[..., 0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            percentile = np.where(row > 0, 100 * (lower + 0.5 * equal) / n, np.nan)
+
+        return pd.DataFrame({
+            **self._tables.domain_columns,
+            "Rating": row.ravel(),
+            "Cohort Median": _histogram_quantile(counts, 0.5).ravel(),
+            "Percentile": percentile.ravel(),
+        })
+
+    def category_rank(self, partner_name):
+        """Mid-rank percentile of a partner's category averages per phase."""
+        means = self._category_means[:len(self)]
+        mine = means[self._index[partner_name]]
+        assessed = ~np.isnan(means)
+        lower = (means < mine).sum(axis=0)
+        equal = (means == mine).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            percentile = np.where(np.isnan(mine), np.nan, 100 * (lower + 0.5 * equal) / assessed.sum(axis=0))
+        return pd.DataFrame({
+            **self._tables.category_columns,
+            "Average": mine.ravel(),
+            "Percentile": percentile.ravel(),
+        })
+
+def _category_means(row, category_matrix):
+    """Average rating per category and phase, ignoring unassessed domains."""
+    assessed = (row > 0).astype(np.float64)
+    sums = category_matrix @ (row * assessed)
+    counts = category_matrix @ assessed
+    return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+def _histogram_quantile(counts, q):
+    """Lowest level reached by at least ``q`` of the partners, NaN if none."""
+    n = counts.sum(axis=-1, keepdims=True)
+    reached = counts.cumsum(axis=-1) >= q * n
+    level = reached.argmax(axis=-1) + 1.0
+    return np.where(n[..., 0] > 0, level, np.nan)
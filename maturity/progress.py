@@ -0,0 +1,141 @@
+"""Progress of a partner across assessment rounds.
+
+Every completed assessment is kept as a timestamped round in the
+``CohortStore`` (see ``maturity.cohort``). A ``ProgressHistory`` holds one
+partner's rounds as a rounds x domains x phases ratings array, so rating
+changes between any two rounds, category movement and trend lines are
+computed with a few array operations, whatever the number of rounds::
+
+    history = ProgressHistory.from_cohort(store, "Acme")
+    history.deltas()          # latest round against the one before
+    history.trend(rounds=4)   # rating change per round over the last four
+
+A rating of 0 marks a domain not assessed in a round; it is left out of
+every comparison.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from maturity.framework import default_framework
+from maturity.model import ratings_array
+from maturity.portfolio import portfolio_tables
+
+class ProgressHistory:
+    """A partner's assessment rounds, oldest first."""
+
+    def __init__(self, timestamps, ratings, framework=None):
+        self.framework = framework or default_framework()
+        self._tables = portfolio_tables(self.framework)
+        order = np.argsort(np.asarray(timestamps, dtype=np.float64), kind="stable")
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)[order]
+        self.ratings = np.asarray(ratings, dtype=np.float64).reshape(
+            (-1, len(self.framework.domains), len(self.framework.phases)))[order]
+        self._category_means = None
+
+    @classmethod
+    def from_cohort(cls, store, partner_name, until=None):
+        """Load a partner's rounds from a ``CohortStore``, up to assessment ``until`` if given."""
+        mask = store.rounds(partner_name, until)
+        # Rows appended since the select are not part of the mask
+        timestamps = store.timestamps[:len(mask)][mask]
+        return cls(timestamps, store.ratings(mask), store.framework)
+
+    def with_round(self, results, timestamp=None):
+        """Return a history with ``results`` as a provisional latest round.
+
+        Meant for an assessment the cohort store has not recorded. Results
+        equal to the current latest round are not added again.
+        """
+        row = ratings_array(results, self.framework, np.float64)
+        if len(self) and np.array_equal(self.ratings[-1], row):
+            return self
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc).timestamp()
+        return ProgressHistory(np.append(self.timestamps, timestamp),
+                               np.concatenate([self.ratings, row[None]]), self.framework)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def labels(self):
+        """A display label per round: its number and date."""
+        return [
+            f"Round {i} ({datetime.fromtimestamp(t, timezone.utc):%Y-%m-%d})"
+            for i, t in enumerate(self.timestamps, start=1)
+        ]
+
+    @property
+    def category_means(self):
+        """Average rating per round, category and phase; NaN where nothing was assessed."""
+        if self._category_means is None:
+            assessed = (self.ratings > 0).astype(np.float64)
+            matrix = self._tables.category_matrix
+            sums = np.einsum("cd,rdp->rcp", matrix, self.ratings * assessed)
+            counts = np.einsum("cd,rdp->rcp", matrix, assessed)
+            self._category_means = np.divide(
+                sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+        return self._category_means
+
+    def phase_means(self):
+        """Average rating per round and phase across assessed domains."""
+        assessed = self.ratings > 0
+        counts = assessed.sum(axis=1)
+        sums = self.ratings.sum(axis=1)
+        return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+    def deltas(self, start=-2, end=-1):
+        """Rating change per domain and phase from round ``start`` to round ``end``.
+
+        Rounds are indexes into the history (negative from the latest). Only
+        domains assessed in both rounds are listed.
+        """
+        before, after = self.ratings[start], self.ratings[end]
+        keep = ((before > 0) & (after > 0)).ravel()
+        columns = self._tables.domain_columns
+        return pd.DataFrame({
+            "Category": columns["Category"][keep],
+            "Domain": columns["Domain"][keep],
+            "Phase": columns["Phase"][keep],
+            "From": before.ravel()[keep].astype(int),
+            "To": after.ravel()[keep].astype(int),
+            "Change": (after - before).ravel()[keep].astype(int),
+        })
+
+    def category_deltas(self, start=-2, end=-1):
+        """Change of each category's average rating per phase between two rounds."""
+        before, after = self.category_means[start], self.category_means[end]
+        keep = (~np.isnan(before) & ~np.isnan(after)).ravel()
+        columns = self._tables.category_columns
+        return pd.DataFrame({
+            "Category": columns["Category"][keep],
+            "Phase": columns["Phase"][keep],
+            "From": before.ravel()[keep],
+            "To": after.ravel()[keep],
+            "Change": (after - before).ravel()[keep],
+        })
+
+    def trend(self, rounds=None):
+        """Least-squares rating change per round for each domain and phase.
+
+        Uses the last ``rounds`` rounds (default: all); a domain needs at
+        least two assessed rounds in that window to get a slope.
+        """
+        ratings = self.ratings[-rounds:] if rounds else self.ratings
+        assessed = (ratings > 0).astype(np.float64)
+        x = np.arange(len(ratings), dtype=np.float64)[:, None, None] * assessed
+        n = assessed.sum(axis=0)
+        sx, sy = x.sum(axis=0), ratings.sum(axis=0)
+        sxx, sxy = (x * x).sum(axis=0), (x * ratings).sum(axis=0)
+        denominator = n * sxx - sx * sx
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slope = np.where((n >= 2) & (denominator > 0),
+                             (n * sxy - sx * sy) / denominator, np.nan)
+        return pd.DataFrame({
+            **self._tables.domain_columns,
+            "Rounds": n.ravel().astype(int),
+            "Slope": slope.ravel(),
+        })
@@ -0,0 +1,102 @@
+"""Domain-keyed assessment results with incrementally maintained aggregates.
+
+``ResultSet`` holds one slot per framework domain, so results always iterate
+in framework order no matter in which order domains are saved or edited.
+Category rating sums are updated as each domain is set, and the
+``RatingAggregates`` the results views read are rebuilt from those sums only
+after a change, instead of re-scanning every result on each rerun.
+"""
+
+import numpy as np
+import pandas as pd
+
+from maturity.aggregate import RatingAggregates
+from maturity.framework import default_framework
+from maturity.model import normalize_result
+
+class ResultSet:
+    """The results of one assessment, iterable as ``DomainResult`` objects."""
+
+    def __init__(self, framework=None, results=()):
+        self.framework = framework or default_framework()
+        domains, phases = len(self.framework.domains), len(self.framework.phases)
+        categories = list(self.framework.categories)
+        self._category_index = {category: i for i, category in enumerate(categories)}
+        self._results = [None] * domains
+        self._ratings = np.zeros((domains, phases), dtype=np.int64)
+        self._category_sums = np.zeros((len(categories), phases))
+        self._category_counts = np.zeros(len(categories), dtype=np.int64)
+        self._aggregates = None
+        for result in results:
+            self.set(result)
+
+    def set(self, result):
+        """Add or replace the result of a domain (a ``DomainResult`` or dict row)."""
+        result = normalize_result(result, self.framework)
+        i = self.framework.domain_index[result.domain]
+        c = self._category_index[result.category]
+        if self._results[i] is not None:
+            self._category_sums[c] -= self._ratings[i]
+            self._category_counts[c] -= 1
+        self._results[i] = result
+        self._ratings[i] = result.ratings
+        self._category_sums[c] += self._ratings[i]
+        self._category_counts[c] += 1
+        self._aggregates = None
+
+    def remove(self, domain):
+        """Drop the result of a domain, if there is one."""
+        i = self.framework.domain_index[domain]
+        if self._results[i] is None:
+            return
+        c = self._category_index[self._results[i].category]
+        self._category_sums[c] -= self._ratings[i]
+        self._category_counts[c] -= 1
+        self._results[i] = None
+        self._ratings[i] = 0
+        self._aggregates = None
+
+    def get(self, domain, default=None):
+        """Return the ``DomainResult`` of a domain, or ``default``."""
+        i = self.framework.domain_index.get(domain)
+        result = self._results[i] if i is not None else None
+        return default if result is None else result
+
+    def __contains__(self, domain):
+        return self.get(domain) is not None
+
+    def __iter__(self):
+        return (result for result in self._results if result is not None)
+
+    def __len__(self):
+        return sum(result is not None for result in self._results)
+
+    @property
+    def aggregates(self):
+        """``RatingAggregates`` of the current results, rebuilt only after a change."""
+        if self._aggregates is None:
+            self._aggregates = self._build_aggregates()
+        return self._aggregates
+
+    def _build_aggregates(self):
+        framework = self.framework
+        phases = list(framework.phases)
+        rows = [i for i, result in enumerate(self._results) if result is not None]
+
+        domains = pd.DataFrame(self._ratings[rows], columns=phases)
+        domains.insert(0, "Domain", [framework.domains[i] for i in rows])
+        domains.insert(0, "Category", [self._results[i].category for i in rows])
+
+        # Domains are grouped by category in framework order, so this keeps
+        # categories in the order they first appear, like ``aggregate_ratings``
+        present = np.flatnonzero(self._category_counts)
+        means = self._category_sums[present] / self._category_counts[present, None]
+        categories = pd.DataFrame(means, columns=phases)
+        categories.insert(0, "Category", [list(framework.categories)[i] for i in present])
+
+        count = self._category_counts.sum()
+        overall_means = self._category_sums.sum(axis=0) / count if count else np.zeros(len(phases))
+        overall = dict(zip(phases, overall_means.tolist()))
+
+        return RatingAggregates(phases=phases, domains=domains, categories=categories,
+                                overall=overall)
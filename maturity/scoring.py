@@ -0,0 +1,16 @@
+"""Rating lookups shared by the UI views and the Excel report."""
+
+import numbers
+
+from maturity.framework import default_framework
+
+def get_rating_color(rating, framework=None):
+    """Get color for a rating value, handling float values."""
+    if isinstance(rating, numbers.Real):
+        # Round float values to nearest integer for color mapping
+        return (framework or default_framework()).rating_color(rating)
+    return '#FFFFFF'
+
+def get_category_for_domain(domain, framework=None):
+    """Helper to find the category for a given domain."""
+    return (framework or default_framework()).category_for_domain(domain)
@@ -0,0 +1,234 @@
+"""Compact binary snapshots of a single assessment.
+
+A snapshot packs an assessment into a few hundred bytes:
+
+* ratings as one byte per domain and phase (0 = not rated),
+* every string (names, partner details, comments) once in a string table,
+  referenced by 16- or 32-bit indexes,
+* the domain and phase names and the framework version it was taken with.
+
+Because the names are stored, a snapshot still loads after the framework
+changes: domains and phases are matched by name and anything the current
+framework no longer has is dropped. The layout itself is versioned by
+``FORMAT_VERSION``. All integers are little-endian::
+
+    magic "AIMS" | u8 format version | u8 index width | u16 domains | u8 phases
+    u32 strings | strings as (u32 length, UTF-8 bytes) | index: framework version
+    index: partner name | indexes: domain names | indexes: phase names
+    u8 completed flag per domain | u8 ratings | indexes: partner details
+    indexes: comments
+"""
+
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from maturity.framework import default_framework
+from maturity.model import make_domain_result
+
+MAGIC = b"AIMS"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sBBHBI")
+
+class SnapshotError(ValueError):
+    """Raised when bytes are not a snapshot this version can read."""
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Snapshot:
+    """One assessment in the layout it is encoded in."""
+    partner_name: str
+    framework_version: str
+    domains: tuple
+    phases: tuple
+    ratings: np.ndarray      # uint8, domains x phases, 0 = not rated
+    partner_details: tuple   # domains x phases tuples of strings
+    comments: tuple          # domains x phases tuples of strings
+    completed: frozenset     # domain names saved with "Save & Continue"
+
+    @classmethod
+    def from_domain_states(cls, partner_name, domain_states, completed=(), framework=None):
+        """Build a snapshot from the app's ``domain_states`` (domain -> phase -> state)."""
+        framework = framework or default_framework()
+        return cls.from_named_states(partner_name, domain_states, completed, framework.version,
+                                     framework.domains, framework.phases)
+
+    @classmethod
+    def from_named_states(cls, partner_name, domain_states, completed=(), framework_version="",
+                          domains=(), phases=()):
+        """Build a snapshot laid out by the names in ``domain_states``, without a framework.
+
+        ``domains`` and ``phases`` are laid out first, in their order; names
+        only found in ``domain_states`` follow.
+        """
+        domains = tuple(dict.fromkeys([*domains, *domain_states]))
+        phases = tuple(dict.fromkeys([*phases, *(
+            phase for phase_states in domain_states.values() for phase in phase_states)]))
+        domain_index = {domain: i for i, domain in enumerate(domains)}
+        phase_index = {phase: j for j, phase in enumerate(phases)}
+        ratings = np.zeros((len(domains), len(phases)), dtype=np.uint8)
+        details = [[""] * len(phases) for _ in domains]
+        comments = [[""] * len(phases) for _ in domains]
+        for domain, phase_states in domain_states.items():
+            i = domain_index[domain]
+            for phase, state in phase_states.items():
+                j = phase_index[phase]
+                ratings[i, j] = int(state["rating"])
+                details[i][j] = state.get("partner_details", "") or ""
+                comments[i][j] = state.get("comments", "") or ""
+        return cls(
+            partner_name=partner_name,
+            framework_version=framework_version,
+            domains=domains,
+            phases=phases,
+            ratings=ratings,
+            partner_details=tuple(map(tuple, details)),
+            comments=tuple(map(tuple, comments)),
+            completed=frozenset(completed),
+        )
+
+    @classmethod
+    def from_results(cls, partner_name, results, framework=None):
+        """Build a snapshot of completed ``DomainResult`` objects."""
+        framework = framework or default_framework()
+        domain_states = {
+            res.domain: {
+                phase: {
+                    "rating": p.rating,
+                    "partner_details": p.partner_details,
+                    "comments": p.comments
+                }
+                for phase, p in zip(framework.phases, res.phases)
+            }
+            for res in results
+        }
+        return cls.from_domain_states(partner_name, domain_states, domain_states, framework)
+
+    def encode(self):
+        """Serialize to bytes."""
+        strings = {"": 0}
+        def index(value):
+            return strings.setdefault(value, len(strings))
+
+        framework_version = index(self.framework_version)
+        partner_name = index(self.partner_name)
+        domains = [index(d) for d in self.domains]
+        phases = [index(p) for p in self.phases]
+        details = [index(s) for row in self.partner_details for s in row]
+        comments = [index(s) for row in self.comments for s in row]
+
+        width = 2 if len(strings) <= 0xFFFF else 4
+        dtype = "<u2" if width == 2 else "<u4"
+        encoded = [s.encode("utf-8") for s in strings]
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, width, len(self.domains),
+                              len(self.phases), len(encoded))]
+        for value in encoded:
+            parts.append(struct.pack("<I", len(value)))
+            parts.append(value)
+        parts.append(np.array(
+            [framework_version, partner_name, *domains, *phases], dtype=dtype).tobytes())
+        parts.append(np.array([d in self.completed for d in self.domains], dtype=np.uint8).tobytes())
+        parts.append(np.ascontiguousarray(self.ratings, dtype=np.uint8).tobytes())
+        parts.append(np.array(details + comments, dtype=dtype).tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def decode(cls, data):
+        """Parse bytes written by ``encode``."""
+        try:
+            magic, version, width, n_domains, n_phases, n_strings = _HEADER.unpack_from(data)
+        except struct.error:
+            raise SnapshotError("not an assessment snapshot (too short)") from None
+        if magic != MAGIC:
+            raise SnapshotError("not an assessment snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"unsupported snapshot format version {version}")
+
+        try:
+            offset = _HEADER.size
+            strings = []
+            for _ in range(n_strings):
+                (length,) = struct.unpack_from("<I", data, offset)
+                offset += 4
+                strings.append(bytes(data[offset:offset + length]).decode("utf-8"))
+                offset += length
+
+            dtype = "<u2" if width == 2 else "<u4"
+            names = np.frombuffer(data, dtype=dtype, count=2 + n_domains + n_phases, offset=offset)
+            offset += names.nbytes
+            completed = np.frombuffer(data, dtype=np.uint8, count=n_domains, offset=offset)
+            offset += n_domains
+            cells = n_domains * n_phases
+            ratings = np.frombuffer(data, dtype=np.uint8, count=cells, offset=offset)
+            offset += cells
+            texts = np.frombuffer(data, dtype=dtype, count=2 * cells, offset=offset)
+
+            domains = tuple(strings[i] for i in names[2:2 + n_domains])
+            phases = tuple(strings[i] for i in names[2 + n_domains:])
+            values = [strings[i] for i in texts]
+        except (ValueError, IndexError, struct.error) as e:
+            raise SnapshotError(f"truncated or corrupt snapshot: {e}") from None
+
+        def table(values):
+            return tuple(tuple(values[r * n_phases:(r + 1) * n_phases]) for r in range(n_domains))
+        return cls(
+            partner_name=strings[names[1]],
+            framework_version=strings[names[0]],
+            domains=domains,
+            phases=phases,
+            ratings=ratings.reshape(n_domains, n_phases).copy(),
+            partner_details=table(values[:cells]),
+            comments=table(values[cells:]),
+            completed=frozenset(d for d, done in zip(domains, completed) if done),
+        )
+
+    def aligned_ratings(self, framework=None):
+        """Ratings rearranged to ``framework`` domain and phase order, 0 where missing."""
+        framework = framework or default_framework()
+        out = np.zeros((len(framework.domains), len(framework.phases)), dtype=np.uint8)
+        rows = [(i, framework.domain_index[d]) for i, d in enumerate(self.domains)
+                if d in framework.domain_index]
+        cols = [(j, framework.phase_index[p]) for j, p in enumerate(self.phases)
+                if p in framework.phase_index]
+        if rows and cols:
+            (src_rows, dst_rows), (src_cols, dst_cols) = zip(*rows), zip(*cols)
+            out[np.ix_(dst_rows, dst_cols)] = self.ratings[np.ix_(src_rows, src_cols)]
+        return out
+
+    def domain_states(self, framework=None):
+        """Rated phases as ``domain_states``, limited to what ``framework`` knows."""
+        framework = framework or default_framework()
+        return {
+            domain: {phase: state for phase, state in phase_states.items()
+                     if phase in framework.phase_index}
+            for domain, phase_states in self.stored_states().items()
+            if domain in framework.domain_index
+            and any(phase in framework.phase_index for phase in phase_states)
+        }
+
+    def stored_states(self):
+        """Every rated phase as ``domain_states``, whichever framework it was taken with."""
+        states = {}
+        for i, domain in enumerate(self.domains):
+            for j, phase in enumerate(self.phases):
+                if self.ratings[i, j]:
+                    states.setdefault(domain, {})[phase] = {
+                        "rating": int(self.ratings[i, j]),
+                        "partner_details": self.partner_details[i][j],
+                        "comments": self.comments[i][j]
+                    }
+        return states
+
+    def results(self, framework=None):
+        """``DomainResult`` objects of completed domains rated in every phase of ``framework``."""
+        framework = framework or default_framework()
+        states = self.domain_states(framework)
+        return [
+            make_domain_result(domain, {
+                phase: {**state, "color": framework.level_colors.get(str(state["rating"]), "")}
+                for phase, state in states[domain].items()
+            }, framework)
+            for domain in framework.domains
+            if domain in self.completed and len(states.get(domain, ())) == len(framework.phases)
+        ]
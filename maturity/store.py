@@ -0,0 +1,500 @@
+"""Persistent storage of in-progress assessments.
+
+``AssessmentStore`` defines the interface the app saves ``domain_states``
+through; ``SQLiteStore`` is the default backend and ``SnapshotStore`` keeps
+one compact binary snapshot file per assessment. ``KeyValueStore`` keeps
+each assessment as a hash in Redis (or the in-memory ``LocalKeyValue``
+stand-in), so several app servers can share assessments. ``DebouncedWriter`` sits in front of a
+store so rapid widget changes are coalesced into one batched write per
+assessment instead of a database round-trip per rerun.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from maturity.framework import default_framework
+from maturity.snapshot import Snapshot, SnapshotError
+
+DEFAULT_DB_PATH = os.environ.get("AI_MATURITY_DB", "assessments.db")
+
+# Assessment IDs arrive in URLs, so only these ever become file names
+_SAFE_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# Separates the domain and phase in a KeyValueStore state field name
+_FIELD_SEP = "\x1f"
+
+@dataclass
+class StoredAssessment:
+    """An assessment as loaded back from a store."""
+    assessment_id: str
+    partner_name: str
+    domain_states: dict                    # domain -> phase -> phase state
+    completed: set = field(default_factory=set)  # domains saved with "Save & Continue"
+    updated_at: float = 0.0
+
+    def is_complete(self, framework=None):
+        framework = framework or default_framework()
+        return all(domain in self.completed for domain in framework.domains)
+
+class AssessmentStore:
+    """Interface for assessment persistence backends."""
+
+    # Whether other app servers can read this store, so changes must be
+    # written at the end of each rerun rather than after the debounce delay
+    shared = False
+
+    def save(self, assessment_id, partner_name, domain_states, completed=()):
+        """Upsert the given domains' phase states for an assessment.
+
+        ``completed`` lists domains to mark as completed; domains are never
+        marked incomplete again.
+        """
+        raise NotImplementedError
+
+    def load(self, assessment_id):
+        """Return the ``StoredAssessment`` for an ID, or None."""
+        raise NotImplementedError
+
+    def find_incomplete(self, partner_name, framework=None):
+        """Return the ID of the partner's latest assessment not complete in ``framework``, or None."""
+        raise NotImplementedError
+
+class SQLiteStore(AssessmentStore):
+    """SQLite-backed assessment store.
+
+    A connection is opened per operation so the store can be shared between
+    Streamlit sessions and the debounced writer's timer thread. The database
+    is local to one server: SQLite locking is not reliable on network
+    filesystems, so it is not ``shared``.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        with self._connect() as conn:
+            # WAL lets sessions keep reading while the writer thread commits
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS assessments (
+                    id TEXT PRIMARY KEY,
+                    partner_name TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS assessments_partner
+                    ON assessments (partner_name, updated_at);
+                CREATE TABLE IF NOT EXISTS domain_phases (
+                    assessment_id TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    phase TEXT NOT NULL,
+                    rating INTEGER NOT NULL,
+                    partner_details TEXT NOT NULL DEFAULT '',
+                    comments TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (assessment_id, domain, phase)
+                );
+                CREATE TABLE IF NOT EXISTS completed_domains (
+                    assessment_id TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    PRIMARY KEY (assessment_id, domain)
+                );
+            """)
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, assessment_id, partner_name, domain_states, completed=()):
+        rows = [
+            (assessment_id, domain, phase, int(state["rating"]),
+             state.get("partner_details", "") or "", state.get("comments", "") or "")
+            for domain, phases in domain_states.items()
+            for phase, state in phases.items()
+        ]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO assessments (id, partner_name, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET partner_name = excluded.partner_name, "
+                "updated_at = excluded.updated_at",
+                (assessment_id, partner_name, time.time())
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO domain_phases "
+                "(assessment_id, domain, phase, rating, partner_details, comments) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO completed_domains (assessment_id, domain) VALUES (?, ?)",
+                [(assessment_id, domain) for domain in completed]
+            )
+
+    def load(self, assessment_id):
+        with self._connect() as conn:
+            header = conn.execute(
+                "SELECT partner_name, updated_at FROM assessments WHERE id = ?",
+                (assessment_id,)
+            ).fetchone()
+            if header is None:
+                return None
+            phase_rows = conn.execute(
+                "SELECT domain, phase, rating, partner_details, comments "
+                "FROM domain_phases WHERE assessment_id = ?",
+                (assessment_id,)
+            ).fetchall()
+            completed = {
+                domain for (domain,) in conn.execute(
+                    "SELECT domain FROM completed_domains WHERE assessment_id = ?",
+                    (assessment_id,)
+                )
+            }
+
+        domain_states = {}
+        for domain, phase, rating, partner_details, comments in phase_rows:
+            domain_states.setdefault(domain, {})[phase] = {
+                "rating": rating,
+                "partner_details": partner_details,
+                "comments": comments
+            }
+        return StoredAssessment(assessment_id, header[0], domain_states, completed, header[1])
+
+    def find_incomplete(self, partner_name, framework=None):
+        domains = (framework or default_framework()).domains
+        with self._connect() as conn:
+            # Only domains of this framework count towards completion
+            row = conn.execute(
+                "SELECT a.id FROM assessments a "
+                "LEFT JOIN completed_domains c ON c.assessment_id = a.id "
+                f"AND c.domain IN ({', '.join('?' * len(domains))}) "
+                "WHERE a.partner_name = ? "
+                "GROUP BY a.id HAVING COUNT(c.domain) < ? "
+                "ORDER BY a.updated_at DESC LIMIT 1",
+                (*domains, partner_name, len(domains))
+            ).fetchone()
+        return row[0] if row else None
+
+class SnapshotStore(AssessmentStore):
+    """Assessment store keeping one ``<id>.aims`` snapshot file per assessment.
+
+    Each save rewrites the assessment's small snapshot atomically.
+    ``find_incomplete`` reads every snapshot, so this suits stores of up to a
+    few thousand assessments, or shared storage where SQLite locking is a
+    problem.
+    """
+
+    # The directory may be on storage other app servers mount
+    shared = True
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, assessment_id):
+        if not _SAFE_ID.fullmatch(assessment_id):
+            raise ValueError(f"Invalid assessment ID: {assessment_id!r}")
+        return os.path.join(self.directory, f"{assessment_id}.aims")
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return Snapshot.decode(f.read())
+        except (FileNotFoundError, SnapshotError):
+            return None
+
+    def save(self, assessment_id, partner_name, domain_states, completed=()):
+        path = self._path(assessment_id)
+        with self._lock:
+            data = _merge_snapshot(self._read(path), partner_name, domain_states, completed)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def load(self, assessment_id):
+        try:
+            path = self._path(assessment_id)
+        except ValueError:
+            return None
+        snapshot = self._read(path)
+        if snapshot is None:
+            return None
+        return _stored_assessment(assessment_id, snapshot, os.path.getmtime(path))
+
+    def find_incomplete(self, partner_name, framework=None):
+        domains = (framework or default_framework()).domains
+        latest, latest_mtime = None, -1.0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".aims"):
+                continue
+            path = os.path.join(self.directory, name)
+            snapshot = self._read(path)
+            if snapshot is None or snapshot.partner_name != partner_name:
+                continue
+            if all(domain in snapshot.completed for domain in domains):
+                continue
+            mtime = os.path.getmtime(path)
+            if mtime > latest_mtime:
+                latest, latest_mtime = name[:-len(".aims")], mtime
+        return latest
+
+class LocalKeyValue:
+    """In-process stand-in for the subset of the Redis client ``KeyValueStore`` uses.
+
+    Like Redis, hash fields and values are stored and returned as bytes.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+    def hset(self, name, key=None, value=None, mapping=None):
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        with self._lock:
+            fields = self._data.setdefault(name, {})
+            added = 0
+            for field_name, field_value in items.items():
+                added += self._bytes(field_name) not in fields
+                fields[self._bytes(field_name)] = self._bytes(field_value)
+        return added
+
+    def hgetall(self, name):
+        with self._lock:
+            return dict(self._data.get(name, {}))
+
+    def hkeys(self, name):
+        with self._lock:
+            return list(self._data.get(name, {}))
+
+    def pipeline(self):
+        return _LocalPipeline(self)
+
+class _LocalPipeline:
+    """Queues ``LocalKeyValue`` commands and runs them atomically, like a Redis MULTI."""
+
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, command):
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        with self._client._lock:
+            results = [getattr(self._client, command)(*args, **kwargs)
+                       for command, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+class KeyValueStore(AssessmentStore):
+    """Assessment store keeping assessments in Redis or a compatible key-value store.
+
+    Each assessment is one hash: its partner name, when it was last saved,
+    a JSON state per domain and phase, and a flag per completed domain.
+    Saving only sets the fields that changed, so a save is a single
+    pipelined round trip with no read first, and a load is one ``HGETALL``.
+    A hash per partner maps their assessment IDs to the time they were last
+    saved, for ``find_incomplete``.
+
+    Without a ``client`` the store lives in this process's memory, which
+    suits tests and a single server.
+    """
+
+    def __init__(self, client=None, prefix="ai_maturity:"):
+        self.client = client if client is not None else LocalKeyValue()
+        self.prefix = prefix
+        # Only a real server is visible to other app servers
+        self.shared = not isinstance(self.client, LocalKeyValue)
+
+    def _key(self, assessment_id):
+        return f"{self.prefix}assessment:{assessment_id}"
+
+    def _partner_key(self, partner_name):
+        return f"{self.prefix}partner:{partner_name}"
+
+    def save(self, assessment_id, partner_name, domain_states, completed=()):
+        now = repr(time.time())
+        fields = {"partner_name": partner_name, "updated_at": now}
+        for domain, phase_states in domain_states.items():
+            for phase, state in phase_states.items():
+                fields[f"state:{domain}{_FIELD_SEP}{phase}"] = json.dumps({
+                    "rating": int(state["rating"]),
+                    "partner_details": state.get("partner_details", "") or "",
+                    "comments": state.get("comments", "") or ""
+                })
+        for domain in completed:
+            fields[f"completed:{domain}"] = "1"
+        pipe = self.client.pipeline()
+        pipe.hset(self._key(assessment_id), mapping=fields)
+        pipe.hset(self._partner_key(partner_name), assessment_id, now)
+        pipe.execute()
+
+    def load(self, assessment_id):
+        fields = self.client.hgetall(self._key(assessment_id))
+        if not fields:
+            return None
+        domain_states, completed = {}, set()
+        for name, value in fields.items():
+            kind, _, rest = name.decode("utf-8").partition(":")
+            if kind == "state":
+                domain, phase = rest.split(_FIELD_SEP)
+                domain_states.setdefault(domain, {})[phase] = json.loads(value)
+            elif kind == "completed":
+                completed.add(rest)
+        return StoredAssessment(
+            assessment_id,
+            fields[b"partner_name"].decode("utf-8"),
+            domain_states,
+            completed,
+            float(fields.get(b"updated_at", 0.0))
+        )
+
+    def find_incomplete(self, partner_name, framework=None):
+        domains = (framework or default_framework()).domains
+        saved = self.client.hgetall(self._partner_key(partner_name))
+        ids = [assessment_id.decode("utf-8")
+               for assessment_id, _ in sorted(saved.items(), key=lambda item: -float(item[1]))]
+        # The field names of every assessment in one round trip
+        pipe = self.client.pipeline()
+        for assessment_id in ids:
+            pipe.hkeys(self._key(assessment_id))
+        for assessment_id, names in zip(ids, pipe.execute() if ids else ()):
+            completed = {name.decode("utf-8") for name in names}
+            if names and not all(f"completed:{domain}" in completed for domain in domains):
+                return assessment_id
+        return None
+
+def _merge_snapshot(snapshot, partner_name, domain_states, completed):
+    """Encode ``snapshot`` (or nothing) updated with the given domains.
+
+    The merge goes by the names stored in the snapshot, so domains of any
+    framework are kept, whichever framework is the default.
+    """
+    if snapshot is None:
+        return Snapshot.from_named_states(partner_name, domain_states, completed).encode()
+    states = snapshot.stored_states()
+    for domain, phase_states in domain_states.items():
+        states.setdefault(domain, {}).update(phase_states)
+    return Snapshot.from_named_states(
+        partner_name, states, snapshot.completed | set(completed),
+        snapshot.framework_version, snapshot.domains, snapshot.phases).encode()
+
+def _stored_assessment(assessment_id, snapshot, updated_at):
+    """The ``StoredAssessment`` of a decoded snapshot."""
+    return StoredAssessment(
+        assessment_id,
+        snapshot.partner_name,
+        snapshot.stored_states(),
+        set(snapshot.completed),
+        updated_at
+    )
+
+def open_store():
+    """Open the store the environment asks for.
+
+    ``AI_MATURITY_REDIS_URL`` selects a ``KeyValueStore`` on that Redis
+    server, shared by every app server using it. ``AI_MATURITY_SNAPSHOT_DIR``
+    selects a ``SnapshotStore`` in that directory; otherwise assessments go
+    to SQLite at ``AI_MATURITY_DB``.
+    """
+    redis_url = os.environ.get("AI_MATURITY_REDIS_URL")
+    if redis_url:
+        # redis is only needed for shared deployments, so it is imported here
+        import redis
+
+        return KeyValueStore(redis.Redis.from_url(redis_url))
+    directory = os.environ.get("AI_MATURITY_SNAPSHOT_DIR")
+    return SnapshotStore(directory) if directory else SQLiteStore()
+
+class DebouncedWriter:
+    """Coalesce rapid saves to a store and write them in batches.
+
+    ``stage`` only records the latest state in memory and schedules a flush
+    ``delay`` seconds later; further changes in that window are merged into
+    the same write. ``flush`` writes everything pending immediately.
+
+    Flushes are serialized, so a batch taken later is never overwritten by
+    an earlier one that is still being written.
+    """
+
+    def __init__(self, store, delay=2.0):
+        self.store = store
+        self.delay = delay
+        self._pending = {}  # assessment_id -> (partner_name, domain_states, completed)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._timer = None
+
+    def stage(self, assessment_id, partner_name, domain, phase_states, completed=False):
+        """Record a domain's phase states for the next write."""
+        with self._lock:
+            _, domain_states, done = self._pending.get(assessment_id, (partner_name, {}, set()))
+            domain_states[domain] = phase_states
+            if completed:
+                done.add(domain)
+            self._pending[assessment_id] = (partner_name, domain_states, done)
+            self._schedule()
+
+    def _schedule(self):
+        """Start the flush timer unless it is running. Call with the lock held."""
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self, assessment_id=None, partner_name=None):
+        """Write pending changes now: all of them, or one assessment's or partner's.
+
+        If the store raises, the changes not yet written are staged again,
+        under any made since, and the error is re-raised.
+        """
+        with self._save_lock:
+            with self._lock:
+                if assessment_id is None and partner_name is None:
+                    pending, self._pending = self._pending, {}
+                else:
+                    pending = {
+                        staged_id: self._pending.pop(staged_id)
+                        for staged_id, (staged_partner, _, _) in list(self._pending.items())
+                        if staged_id == assessment_id or staged_partner == partner_name
+                    }
+                if self._timer is not None and not self._pending:
+                    self._timer.cancel()
+                    self._timer = None
+            pending = list(pending.items())
+            for i, (assessment_id, (partner_name, domain_states, completed)) in enumerate(pending):
+                try:
+                    self.store.save(assessment_id, partner_name, domain_states, completed)
+                except Exception:
+                    self._restage(pending[i:])
+                    raise
+
+    def _restage(self, batches):
+        """Put unwritten batches back, keeping changes staged after they were taken."""
+        with self._lock:
+            for assessment_id, (partner_name, domain_states, completed) in batches:
+                newer = self._pending.get(assessment_id)
+                if newer is not None:
+                    partner_name = newer[0]
+                    domain_states = {**domain_states, **newer[1]}
+                    completed = set(completed) | newer[2]
+                self._pending[assessment_id] = (partner_name, domain_states, set(completed))
+            self._schedule()
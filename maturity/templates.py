@@ -0,0 +1,269 @@
+"""Report templates: the parts of a report that are the same for every partner.
+
+A ``ReportTemplate`` is compiled once per framework (and so once per
+framework file version) and shared by every report built with it. It holds
+the cell styles, table headers, column widths, the whole "Definitions"
+sheet and the chart skeletons, so an export only has to fill in the
+partner's own rows and series ranges.
+
+``LevelTexts`` does the same for the maturity level text the assessment
+form shows and saves: selectbox labels, bullet lists and comments.
+"""
+
+import copy
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+# Series colors for the phases in report charts: Blue, Orange, Gray, ...
+PHASE_COLORS = ['#4472C4', '#ED7D31', '#A5A5A5', '#FFC000', '#5B9BD5', '#70AD47']
+
+# Cell styles by name; rating cells add the maturity color as ``bg_color``
+STYLES = {
+    'details_label': {
+        'bold': True,
+        'font_size': 12,
+        'align': 'left',
+        'valign': 'vcenter',
+        'font_color': '#003366'
+    },
+    'details_value': {
+        'font_size': 11,
+        'align': 'left',
+        'valign': 'vcenter'
+    },
+    'ratings_header': {
+        'bg_color': '#003366',
+        'font_color': 'white',
+        'bold': True,
+        'align': 'center',
+        'valign': 'vcenter',
+        'border': 1,
+        'text_wrap': True
+    },
+    'ratings_cell': {
+        'border': 1,
+        'text_wrap': True,
+        'align': 'center',
+        'valign': 'vcenter'
+    },
+    'ratings_rating': {
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter'
+    },
+    'heatmap_header': {
+        'bold': True,
+        'font_size': 11,
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#D9D9D9'
+    },
+    'heatmap_cell': {
+        'align': 'center',
+        'valign': 'vcenter',
+        'font_size': 10
+    },
+    'comments_header': {
+        'bg_color': '#003366',
+        'font_color': 'white',
+        'bold': True,
+        'align': 'center',
+        'border': 1
+    },
+    'comments_cell': {'border': 1, 'align': 'center'},
+    'definitions_header': {
+        'font_color': 'black',
+        'bold': True,
+        'align': 'center',
+        'border': 1,
+        'text_wrap': True
+    },
+    'definitions_cell': {'border': 1, 'text_wrap': True},
+    'charts_header': {
+        'bold': True,
+        'bg_color': '#4472C4',
+        'font_color': 'white',
+        'align': 'center',
+        'border': 1
+    },
+    'charts_rating': {'align': 'center', 'border': 1},
+    'progress_change': {'border': 1, 'align': 'center'},
+    'progress_up': {
+        'border': 1,
+        'align': 'center',
+        'font_color': '#006100',
+        'bg_color': '#C6EFCE'
+    },
+    'progress_down': {
+        'border': 1,
+        'align': 'center',
+        'font_color': '#9C0006',
+        'bg_color': '#FFC7CE'
+    },
+}
+
+RATINGS_HEADERS = ("Category", "Domain", "Phase", "Rating", "Summary")
+COMMENTS_HEADERS = ("Domain", "Phase", "Rating", "Selected Points", "Partner Specific Details")
+PROGRESS_HEADERS = ("Category", "Domain", "Phase", "From", "To", "Change")
+
+_RATING_AXIS = {
+    'name': 'Rating',
+    'min': 0,
+    'max': 5,
+    'major_unit': 1,
+    'font': {'size': 10},
+    'num_font': {'size': 9},
+}
+
+def _column_chart(title, axis_name):
+    """Options shared by the domain and category column charts."""
+    return {
+        'title': {'name': title, 'font': {'size': 12, 'bold': True}},
+        'x_axis': {
+            'name': axis_name,
+            'font': {'size': 10},
+            'num_font': {'size': 9},
+            'label_position': 'low',
+            'num_format': '@'  # Treat as text to show full names
+        },
+        'y_axis': _RATING_AXIS,
+        'size': {'width': 720, 'height': 400},
+        'legend': {'position': 'bottom'},
+    }
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ReportTemplate:
+    """Precomputed static report content for one framework."""
+    framework: object
+    ratings_headers: tuple
+    comments_headers: tuple
+    progress_headers: tuple          # (domain changes, category changes, averages by round)
+    heatmap_headers: tuple           # (domain table headers, category table headers)
+    level_summaries: MappingProxyType  # int rating -> level name
+    definitions: tuple               # rows of (col, value, style, rating) cells, in row order
+    definition_columns: int
+    charts: MappingProxyType         # chart name -> type, series styles and chart options
+
+    def chart_options(self, name):
+        """Return a fresh copy of a chart skeleton, safe to hand to xlsxwriter."""
+        return copy.deepcopy(self.charts[name])
+
+@dataclass(frozen=True, slots=True, eq=False)
+class LevelTexts:
+    """Pre-rendered text of each maturity level, keyed by level string."""
+    labels: MappingProxyType    # "3" -> "3 - Defined"
+    markdown: MappingProxyType  # bullet list shown under the rating
+    comments: MappingProxyType  # "Selected Points" text saved with a rating
+    format_label: object        # ``labels`` lookup, for ``format_func``
+
+@lru_cache(maxsize=None)
+def level_texts(framework):
+    """Render the ``LevelTexts`` of a framework once per process."""
+    labels = MappingProxyType(
+        {level: f"{level} - {framework.level_names[level]}" for level in framework.levels})
+    return LevelTexts(
+        labels=labels,
+        markdown=MappingProxyType({
+            level: "\n".join(f"- {point}" for point in points)
+            for level, points in framework.level_details.items()
+        }),
+        comments=MappingProxyType({
+            level: "\n- ".join(["", *points])
+            for level, points in framework.level_details.items()
+        }),
+        format_label=labels.__getitem__,
+    )
+
+@lru_cache(maxsize=None)
+def report_template(framework):
+    """Compile the ``ReportTemplate`` of a framework once per process."""
+    phases = framework.phases
+    phase_colors = list(zip(phases, PHASE_COLORS))
+
+    definitions = [tuple(
+        (i, f"{level} = {framework.level_names[level]}", 'definitions_header', int(level))
+        for i, level in enumerate(framework.levels)
+    )]
+    depth = max((len(d) for d in framework.level_details.values()), default=0)
+    for row_index in range(depth):
+        definitions.append(tuple(
+            (i, framework.level_details[level][row_index], 'definitions_cell', None)
+            for i, level in enumerate(framework.levels)
+            if row_index < len(framework.level_details[level])
+        ))
+
+    column_series = tuple(
+        {'fill': {'color': color}, 'border': {'color': color}} for _, color in phase_colors
+    )
+    charts = {
+        'domain': {
+            'type': 'column',
+            **_column_chart('Domain Level Maturity Ratings', 'Domains'),
+            'series': column_series,
+        },
+        'category': {
+            'type': 'column',
+            **_column_chart('Category Level Maturity Ratings', 'Categories'),
+            'series': column_series,
+        },
+        'radar': {
+            'type': 'radar',
+            'title': {'name': 'Capability Rating by Domain', 'font': {'size': 12, 'bold': True}},
+            'size': {'width': 500, 'height': 300},
+            'series': tuple(
+                {'name': phase, 'marker': {'type': 'automatic'},
+                 'line': {'width': 2.25, 'color': color}}
+                for phase, color in phase_colors
+            ),
+        },
+        'progress': {
+            'type': 'line',
+            'title': {'name': 'Average Rating by Round', 'font': {'size': 12, 'bold': True}},
+            'x_axis': {'name': 'Round', 'font': {'size': 10}, 'num_font': {'size': 9}},
+            'y_axis': _RATING_AXIS,
+            'size': {'width': 600, 'height': 320},
+            'legend': {'position': 'bottom'},
+            'series': tuple(
+                {'marker': {'type': 'circle', 'fill': {'color': color},
+                            'border': {'color': color}},
+                 'line': {'width': 2.25, 'color': color}}
+                for _, color in phase_colors
+            ),
+        },
+        'scatter': {
+            'type': 'scatter',
+            'title': {'name': 'Plan & Design vs Implement', 'font': {'size': 12, 'bold': True}},
+            'x_axis': {'name': 'Plan & Design', 'min': 0, 'max': 5,
+                       'major_gridlines': {'visible': True}},
+            'y_axis': {'name': 'Implement', 'min': 0, 'max': 5,
+                       'major_gridlines': {'visible': True}},
+            'size': {'width': 500, 'height': 300},
+            'series': ({
+                'name': 'Domains',
+                'marker': {
+                    'type': 'circle',
+                    'size': 10,
+                    'fill': {'color': '#4472C4'},
+                    'border': {'color': '#2F528F'}
+                }
+            },),
+        },
+    }
+
+    domain_headers = ('Domain', *phases)
+    return ReportTemplate(
+        framework=framework,
+        ratings_headers=RATINGS_HEADERS,
+        comments_headers=COMMENTS_HEADERS,
+        progress_headers=(PROGRESS_HEADERS,
+                          tuple(h for h in PROGRESS_HEADERS if h != "Domain"),
+                          ('Round', *phases)),
+        heatmap_headers=(domain_headers,
+                         tuple(h.replace('Domain', 'Category') for h in domain_headers)),
+        level_summaries=MappingProxyType(
+            {int(level): name for level, name in framework.level_names.items()}),
+        definitions=tuple(definitions),
+        definition_columns=len(framework.levels),
+        charts=MappingProxyType(charts),
+    )
@@ -0,0 +1,79 @@
+"""The assessments a user has open side by side in one session.
+
+A ``Workspace`` lists the open assessments, most recently used last. Only
+the active assessment lives in full in session state; the others are
+parked as compact snapshots (see ``maturity.snapshot``), and beyond
+``max_cached`` of them the least recently used are evicted to the
+assessment store, which already holds their state. Memory per session stays
+bounded however many partners are open::
+
+    workspace.park(assessment_id, partner_name, domain_states, completed)
+    snapshot = workspace.unpark(other_id)  # None once evicted: load it from the store
+"""
+
+from collections import OrderedDict
+
+from maturity.snapshot import Snapshot
+
+class Workspace:
+    """Open assessments with an LRU cache of parked snapshots."""
+
+    def __init__(self, max_cached=4, max_open=20):
+        self.max_cached = max_cached
+        self.max_open = max_open
+        self._open = OrderedDict()    # assessment_id -> partner_name
+        self._parked = OrderedDict()  # assessment_id -> snapshot bytes
+        self._completed = {}          # assessment_id -> completed domains when last parked
+
+    def __contains__(self, assessment_id):
+        return assessment_id in self._open
+
+    def __len__(self):
+        return len(self._open)
+
+    def items(self):
+        """``(assessment_id, partner_name)`` pairs, least recently used first."""
+        return list(self._open.items())
+
+    def completed(self, assessment_id):
+        """Domains completed when the assessment was last parked, kept after eviction."""
+        return self._completed.get(assessment_id, frozenset())
+
+    def open(self, assessment_id, partner_name):
+        """Add an assessment or mark it as the most recently used.
+
+        Past ``max_open`` assessments, the least recently used is dropped
+        from the list; it stays in the store and resumes by partner name.
+        """
+        self._open[assessment_id] = partner_name
+        self._open.move_to_end(assessment_id)
+        while len(self._open) > self.max_open:
+            oldest, _ = self._open.popitem(last=False)
+            self._parked.pop(oldest, None)
+            self._completed.pop(oldest, None)
+
+    def close(self, assessment_id):
+        """Remove an assessment from the workspace."""
+        self._open.pop(assessment_id, None)
+        self._parked.pop(assessment_id, None)
+        self._completed.pop(assessment_id, None)
+
+    def park(self, assessment_id, partner_name, domain_states, completed=(), framework=None):
+        """Keep an assessment that is being switched away from as a snapshot."""
+        self.open(assessment_id, partner_name)
+        snapshot = Snapshot.from_domain_states(partner_name, domain_states, completed, framework)
+        self._parked[assessment_id] = snapshot.encode()
+        self._completed[assessment_id] = snapshot.completed
+        self._parked.move_to_end(assessment_id)
+        while len(self._parked) > self.max_cached:
+            self._parked.popitem(last=False)
+
+    def unpark(self, assessment_id):
+        """Return and drop the parked ``Snapshot`` of an assessment, or None if evicted."""
+        data = self._parked.pop(assessment_id, None)
+        return Snapshot.decode(data) if data is not None else None
+
+    @property
+    def parked_bytes(self):
+        """Total size of the parked snapshots."""
+        return sum(len(data) for data in self._parked.values())
@@ -0,0 +1,51 @@
+"""Tests for the Streamlit app, run with Streamlit's AppTest."""
+
+import os
+
+import pytest
+import streamlit as st
+
+from maturity.framework import default_framework
+from maturity.store import SnapshotStore
+
+pytest.importorskip("streamlit.testing.v1")
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(APP))
+    monkeypatch.setenv("AI_MATURITY_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.delenv("AI_MATURITY_REDIS_URL", raising=False)
+    # Written after the debounce delay, like the single-server default
+    monkeypatch.setattr(SnapshotStore, "shared", False)
+    st.cache_resource.clear()
+    yield lambda: AppTest.from_file(APP, default_timeout=60)
+    st.cache_resource.clear()
+
+def test_reopen_during_debounce_keeps_changes(app):
+    first = app().run()
+    first.text_input(key="partner_name_input").set_value("Acme").run()
+    for i in range(len(first.selectbox)):
+        first.selectbox[i].set_value("5").run()
+    assessment_id = first.session_state.assessment_id
+
+    # A refresh before the debounced write: a new session on the same server
+    second = app()
+    second.query_params["assessment"] = assessment_id
+    second.run()
+
+    assert not second.exception
+    assert [selectbox.value for selectbox in second.selectbox] == ["5"] * len(first.selectbox)
+
+def test_sidebar_shows_progress_of_each_assessment(app):
+    at = app().run()
+    at.text_input(key="partner_name_input").set_value("Acme").run()
+    [button for button in at.button if "Save" in button.label][0].click().run()
+    [button for button in at.sidebar.button if "New" in button.label][0].click().run()
+    at.text_input(key="partner_name_input").set_value("Globex").run()
+
+    count = len(default_framework().domains)
+    assert not at.exception
+    assert at.sidebar.radio[0].options == [f"Acme · 1/{count} domains", f"Globex · 0/{count} domains"]
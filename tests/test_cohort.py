@@ -0,0 +1,96 @@
+"""Tests for maturity.cohort."""
+
+import json
+
+import numpy as np
+import pytest
+
+from maturity.cohort import CohortStore
+from maturity.framework import FRAMEWORK_PATH, compile_framework, default_framework
+from maturity.progress import ProgressHistory
+
+NEW_DOMAIN = "AI Agents & Orchestration"
+
+@pytest.fixture
+def extended_framework():
+    """The default framework with one more domain."""
+    with open(FRAMEWORK_PATH, 'r') as f:
+        data = json.load(f)
+    data["categories"]["Business"].append(NEW_DOMAIN)
+    data["domains"][NEW_DOMAIN] = {phase: "" for phase in data["phases"]}
+    return compile_framework(data)
+
+def ratings(framework, value):
+    return np.full((1, len(framework.domains), len(framework.phases)), value)
+
+def test_appends_from_separate_stores(tmp_path):
+    framework = default_framework()
+    first, second = CohortStore(tmp_path, framework), CohortStore(tmp_path, framework)
+    first.append_ratings(["Acme"], ratings(framework, 1))
+    second.append_ratings(["Globex"], ratings(framework, 2))
+    first.append_ratings(["Initech"], ratings(framework, 3))
+
+    store = CohortStore(tmp_path, framework)
+    assert store.partners == ["Acme", "Globex", "Initech"]
+    assert [store.partners[i] for i in store.partner_ids] == store.partners
+    assert np.flatnonzero(first.select(partners=["Globex"])).tolist() == [1]
+    assert sorted(first.to_portfolio().partners) == ["Acme", "Globex", "Initech"]
+
+def test_column_added_by_another_store(tmp_path, extended_framework):
+    framework = default_framework()
+    old = CohortStore(tmp_path, framework)
+    old.append_ratings(["Acme"], ratings(framework, 2))
+    new = CohortStore(tmp_path, extended_framework)
+    # Appended by a store that does not know the new domain yet
+    old.append_ratings(["Acme"], ratings(framework, 3))
+    new.append_ratings(["Globex"], ratings(extended_framework, 4))
+
+    phase = framework.phases[0]
+    assert new.column(NEW_DOMAIN, phase).tolist() == [0, 0, 4]
+    assert new.column(framework.domains[0], phase).tolist() == [2, 3, 4]
+    assert old.column(framework.domains[0], phase).tolist() == [2, 3, 4]
+
+def test_query_overlapping_an_append(tmp_path, monkeypatch):
+    framework = default_framework()
+    store, other = CohortStore(tmp_path, framework), CohortStore(tmp_path, framework)
+    store.append_ratings(["Acme"], ratings(framework, 2), [1000.0])
+    select = store.select
+
+    def select_then_append(*args, **kwargs):
+        mask = select(*args, **kwargs)
+        other.append_ratings(["Globex"], ratings(framework, 5))
+        return mask
+    monkeypatch.setattr(store, "select", select_then_append)
+
+    history = ProgressHistory.from_cohort(store, "Acme")
+    assert history.timestamps.tolist() == [1000.0]
+    assert store.to_portfolio().partners == ["Acme", "Globex"]
+    assert len(store) == 3
+
+def test_rounds_by_assessment(tmp_path):
+    framework = default_framework()
+    store = CohortStore(tmp_path, framework)
+    store.append_ratings(["Acme"], ratings(framework, 1), [1000.0], ["first"])
+    store.append_ratings(["Acme"], ratings(framework, 2), [2000.0])
+    store.append_ratings(["Acme"], ratings(framework, 3), [3000.0], ["second"])
+    # The first assessment edited and finished again
+    store.append_ratings(["Acme"], ratings(framework, 4), [4000.0], ["first"])
+    store.append_ratings(["Globex"], ratings(framework, 5), [5000.0], ["third"])
+
+    assert np.flatnonzero(store.rounds("Acme")).tolist() == [1, 2, 3]
+    assert np.flatnonzero(store.rounds("Acme", until="second")).tolist() == [1, 2]
+    assert np.flatnonzero(store.rounds("Acme", until="unknown")).tolist() == [1, 2, 3]
+    assert store.recorded("second") and not store.recorded("unknown")
+
+    history = ProgressHistory.from_cohort(store, "Acme", until="second")
+    assert history.ratings[:, 0, 0].tolist() == [2, 3]
+
+def test_assessment_ids_added_to_an_older_store(tmp_path):
+    framework = default_framework()
+    store = CohortStore(tmp_path, framework)
+    store.append_ratings(["Acme"], ratings(framework, 1))
+    (tmp_path / "assessments.S32").unlink()
+
+    store = CohortStore(tmp_path, framework)
+    store.append_ratings(["Acme"], ratings(framework, 2), assessment_ids=["a1"])
+    assert store.assessment_ids.tolist() == [b"", b"a1"]
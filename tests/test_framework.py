@@ -0,0 +1,36 @@
+"""Tests for maturity.framework."""
+
+import json
+
+import pytest
+
+from maturity.framework import FRAMEWORK_PATH, FrameworkError, load_config, validate_framework
+
+@pytest.fixture
+def data():
+    with open(FRAMEWORK_PATH, 'r') as f:
+        return json.load(f)
+
+def load(tmp_path, data):
+    path = tmp_path / "framework.json"
+    path.write_text(json.dumps(data))
+    return load_config(str(path))
+
+def test_default_framework_is_valid(data):
+    assert validate_framework(data) == []
+
+@pytest.mark.parametrize("section", ["maturity_levels", "categories", "domains"])
+def test_section_given_as_a_list(tmp_path, data, section):
+    data[section] = list(data[section])
+    with pytest.raises(FrameworkError, match=f"'{section}' must be an object"):
+        load(tmp_path, data)
+
+def test_details_given_as_text(tmp_path, data):
+    data["maturity_levels"]["1"]["details"] = "One long line"
+    with pytest.raises(FrameworkError, match="maturity level 1 details must be a list of strings"):
+        load(tmp_path, data)
+
+def test_duplicate_phases(tmp_path, data):
+    data["phases"].append(data["phases"][0])
+    with pytest.raises(FrameworkError, match="more than once"):
+        load(tmp_path, data)
@@ -0,0 +1,145 @@
+"""Tests for maturity.importer."""
+
+import csv
+import io
+
+import pytest
+
+from maturity.excel import create_excel_workbook, create_portfolio_workbook
+from maturity.framework import default_framework
+from maturity.importer import AssessmentImportError, read_assessments
+from maturity.model import make_domain_result
+
+def sample_results(framework, rating=2):
+    return [
+        make_domain_result(domain, {
+            phase: {"rating": rating, "comments": f"- {domain} {phase}",
+                    "partner_details": "Notes", "color": framework.level_colors[str(rating)]}
+            for phase in framework.phases
+        }, framework)
+        for domain in framework.domains
+    ]
+
+def write_csv(path, rows, header=("Domain", "Phase", "Rating")):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def all_rows(framework, rating=3):
+    return [(domain, phase, rating) for domain in framework.domains for phase in framework.phases]
+
+def test_report_round_trip(tmp_path):
+    framework = default_framework()
+    results = sample_results(framework)
+    path = tmp_path / "Acme_AI_Maturity_Assessment_Report.xlsx"
+    create_excel_workbook(results, framework, "Acme", str(path))
+
+    [record] = read_assessments(str(path), framework)
+
+    assert record["partner_name"] == "Acme"
+    assert record["results"] == results
+
+def test_portfolio_workbook(tmp_path):
+    framework = default_framework()
+    path = tmp_path / "portfolio.xlsx"
+    create_portfolio_workbook([
+        {"partner_name": "Acme", "results": sample_results(framework, 1)},
+        {"partner_name": "Globex", "results": sample_results(framework, 4)},
+    ], str(path), framework)
+
+    records = read_assessments(str(path), framework)
+
+    assert [r["partner_name"] for r in records] == ["Acme", "Globex"]
+    assert records[1]["results"][0].ratings == (4,) * len(framework.phases)
+
+def test_csv_with_ratings_only(tmp_path):
+    framework = default_framework()
+    path = tmp_path / "Initech.csv"
+    write_csv(path, all_rows(framework))
+
+    [record] = read_assessments(str(path), framework)
+
+    assert record["partner_name"] == "Initech"
+    assert len(record["results"]) == len(framework.domains)
+    # Without Selected Points, each phase gets its level's points
+    comments = record["results"][0].phases[0].comments
+    assert comments and "\n- " in comments
+
+def test_csv_file_object():
+    framework = default_framework()
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(("Partner", "Domain", "Phase", "Rating"))
+    writer.writerows(("Umbrella",) + row for row in all_rows(framework, 5))
+
+    [record] = read_assessments(io.BytesIO(text.getvalue().encode("utf-8")), framework,
+                                filename="upload.csv")
+
+    assert record["partner_name"] == "Umbrella"
+
+def test_missing_columns(tmp_path):
+    path = tmp_path / "bad.csv"
+    write_csv(path, [("x", "y")], header=("Domain", "Score"))
+
+    with pytest.raises(AssessmentImportError, match="missing column.*Phase.*Rating"):
+        read_assessments(str(path))
+
+def test_no_rows(tmp_path):
+    path = tmp_path / "empty.csv"
+    write_csv(path, [])
+
+    with pytest.raises(AssessmentImportError, match="no assessment rows"):
+        read_assessments(str(path))
+
+def test_invalid_rows_are_all_reported(tmp_path):
+    framework = default_framework()
+    domain, phases = framework.domains[0], framework.phases
+    path = tmp_path / "bad.csv"
+    write_csv(path, [
+        ("Unknown Domain", phases[0], 1),
+        (domain, "Unknown Phase", 1),
+        (domain, phases[0], 9),
+        (domain, phases[1], 2),
+        (domain, phases[1], 3),
+    ])
+
+    with pytest.raises(AssessmentImportError) as excinfo:
+        read_assessments(str(path), framework)
+
+    message = str(excinfo.value)
+    assert "unknown domain" in message
+    assert "unknown phase" in message
+    assert "rating '9' is not one of" in message
+    assert "listed more than once" in message
+    assert f"{domain} has no rating for" in message
+
+def test_workbook_without_assessment_sheets(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "other.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Summary"
+    workbook.save(path)
+
+    with pytest.raises(AssessmentImportError, match="neither a 'Comments' nor a 'Ratings' sheet"):
+        read_assessments(str(path))
+
+@pytest.mark.parametrize("rating", ["3.7", "2.5", "nan"])
+def test_fractional_ratings_are_rejected(tmp_path, rating):
+    framework = default_framework()
+    path = tmp_path / "fractional.csv"
+    rows = all_rows(framework)
+    rows[0] = rows[0][:2] + (rating,)
+    write_csv(path, rows)
+
+    with pytest.raises(AssessmentImportError, match=f"rating '{rating}' is not one of"):
+        read_assessments(str(path), framework)
+
+def test_whole_number_ratings_from_spreadsheets(tmp_path):
+    framework = default_framework()
+    path = tmp_path / "whole.csv"
+    write_csv(path, [row[:2] + ("3.0",) for row in all_rows(framework)])
+
+    [record] = read_assessments(str(path), framework)
+
+    assert {result.ratings for result in record["results"]} == {(3,) * len(framework.phases)}
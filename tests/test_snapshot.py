@@ -0,0 +1,64 @@
+"""Tests for maturity.snapshot."""
+
+import struct
+
+import pytest
+
+from maturity.framework import default_framework
+from maturity.snapshot import FORMAT_VERSION, MAGIC, Snapshot, SnapshotError
+
+def sample_snapshot():
+    framework = default_framework()
+    domains = framework.domains
+    domain_states = {
+        domains[0]: {phase: {"rating": 3, "partner_details": "Pilot in Q3", "comments": "- a"}
+                     for phase in framework.phases},
+        domains[1]: {framework.phases[0]: {"rating": 1, "partner_details": "",
+                                           "comments": "Ünïcode ✓"}},
+    }
+    return Snapshot.from_domain_states("Acme", domain_states, [domains[0]], framework)
+
+def test_round_trip():
+    snapshot = sample_snapshot()
+    decoded = Snapshot.decode(snapshot.encode())
+
+    assert decoded.partner_name == "Acme"
+    assert decoded.framework_version == snapshot.framework_version
+    assert decoded.domains == snapshot.domains
+    assert decoded.phases == snapshot.phases
+    assert (decoded.ratings == snapshot.ratings).all()
+    assert decoded.partner_details == snapshot.partner_details
+    assert decoded.comments == snapshot.comments
+    assert decoded.completed == snapshot.completed
+    assert decoded.domain_states() == snapshot.domain_states()
+
+def test_results_only_include_completed_domains():
+    framework = default_framework()
+    results = Snapshot.decode(sample_snapshot().encode()).results(framework)
+
+    assert [res.domain for res in results] == [framework.domains[0]]
+    assert results[0].ratings == (3,) * len(framework.phases)
+
+def test_unsupported_format_version():
+    data = bytearray(sample_snapshot().encode())
+    struct.pack_into("<B", data, len(MAGIC), FORMAT_VERSION + 1)
+
+    with pytest.raises(SnapshotError, match="format version"):
+        Snapshot.decode(bytes(data))
+
+def test_not_a_snapshot():
+    with pytest.raises(SnapshotError, match="not an assessment snapshot"):
+        Snapshot.decode(b"PK\x03\x04" + bytes(16))
+
+@pytest.mark.parametrize("length", [0, 3, 12, 20])
+def test_truncated_header_and_strings(length):
+    data = sample_snapshot().encode()
+
+    with pytest.raises(SnapshotError):
+        Snapshot.decode(data[:length])
+
+def test_truncated_body():
+    data = sample_snapshot().encode()
+
+    with pytest.raises(SnapshotError, match="truncated"):
+        Snapshot.decode(data[:-1])
@@ -0,0 +1,77 @@
+"""Tests for maturity.store."""
+
+import pytest
+
+from maturity.framework import default_framework
+from maturity.store import DebouncedWriter, SnapshotStore, SQLiteStore
+
+def phase_states(rating):
+    return {phase: {"rating": rating, "partner_details": "", "comments": ""}
+            for phase in default_framework().phases}
+
+class FailingStore(SQLiteStore):
+    """Raises on the first ``failures`` saves."""
+
+    def __init__(self, path, failures):
+        super().__init__(path)
+        self.failures = failures
+
+    def save(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        return super().save(*args, **kwargs)
+
+@pytest.fixture
+def domain():
+    return default_framework().domains[0]
+
+def test_staged_changes_are_held_back(tmp_path, domain):
+    writer = DebouncedWriter(SQLiteStore(str(tmp_path / "a.db")), delay=60)
+    writer.stage("a1", "Acme", domain, phase_states(5))
+
+    assert writer.store.load("a1") is None
+    writer.flush("a1")
+    stored = writer.store.load("a1")
+    assert {state["rating"] for state in stored.domain_states[domain].values()} == {5}
+
+def test_flush_one_partner(tmp_path, domain):
+    writer = DebouncedWriter(SQLiteStore(str(tmp_path / "a.db")), delay=60)
+    writer.stage("a1", "Acme", domain, phase_states(2))
+    writer.stage("b1", "Globex", domain, phase_states(3))
+
+    writer.flush(partner_name="Acme")
+
+    assert writer.store.find_incomplete("Acme") == "a1"
+    assert writer.store.load("b1") is None
+    writer.flush()
+    assert writer.store.load("b1") is not None
+
+def test_failed_flush_is_restaged(tmp_path, domain):
+    framework = default_framework()
+    writer = DebouncedWriter(FailingStore(str(tmp_path / "a.db"), failures=1), delay=60)
+    other = framework.domains[1]
+    writer.stage("a1", "Acme", domain, phase_states(1))
+
+    with pytest.raises(OSError):
+        writer.flush()
+    # Changes made after the failed flush win over the restaged ones
+    writer.stage("a1", "Acme", domain, phase_states(4), completed=True)
+    writer.stage("a1", "Acme", other, phase_states(2))
+    writer.flush()
+
+    stored = writer.store.load("a1")
+    assert stored.domain_states[domain][framework.phases[0]]["rating"] == 4
+    assert stored.domain_states[other][framework.phases[0]]["rating"] == 2
+    assert stored.completed == {domain}
+
+def test_snapshot_store_keeps_domains_of_other_frameworks(tmp_path, domain):
+    store = SnapshotStore(str(tmp_path))
+    store.save("a1", "Acme", {"AI Agents & Orchestration": phase_states(4)},
+               ["AI Agents & Orchestration"])
+    store.save("a1", "Acme", {domain: phase_states(2)})
+
+    stored = store.load("a1")
+    assert set(stored.domain_states) == {"AI Agents & Orchestration", domain}
+    assert stored.completed == {"AI Agents & Orchestration"}
+    assert {state["rating"] for state in stored.domain_states["AI Agents & Orchestration"].values()} == {4}